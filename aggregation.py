@@ -0,0 +1,147 @@
+import os
+
+from collections.abc import Iterable, Mapping, Sequence
+from datetime import date, timedelta
+from itertools import repeat
+
+from models import Transaction, TransactionRecord
+
+# Granularities accepted by FinanceManager.summary_range
+GROUP_BY = ("day", "week", "month", "quarter", "year")
+
+# Below this many rows in range a single pass is faster than starting worker processes
+PARALLEL_MIN_ROWS = 1_000_000
+
+# Partial aggregate: (day ordinal, category) -> total in cents
+DailyTotals = dict[tuple[int, str], int]
+
+
+def period_start(day: date, group_by: str) -> date:
+    match group_by:
+        case "day":
+            return day
+        case "week":
+            return day - timedelta(days=day.weekday())
+        case "month":
+            return day.replace(day=1)
+        case "quarter":
+            return date(day.year, (day.month - 1) // 3 * 3 + 1, 1)
+        case "year":
+            return date(day.year, 1, 1)
+    raise ValueError(f"Agrupación desconocida: {group_by} (use {', '.join(GROUP_BY)})")
+
+
+def next_period(start: date, group_by: str) -> date:
+    match group_by:
+        case "day":
+            return start + timedelta(days=1)
+        case "week":
+            return start + timedelta(days=7)
+        case "year":
+            return date(start.year + 1, 1, 1)
+    months = 1 if group_by == "month" else 3
+    month = start.month - 1 + months
+    return date(start.year + month // 12, month % 12 + 1, 1)
+
+
+def periods(start: date, end: date, group_by: str) -> list[date]:
+    # First day of every period that overlaps [start, end]
+    result = []
+    current = period_start(start, group_by)
+    while current <= end:
+        result.append(current)
+        current = next_period(current, group_by)
+    return result
+
+
+def daily_totals(transactions: Iterable[Transaction | TransactionRecord], t_type: str) -> DailyTotals:
+    totals: DailyTotals = {}
+    for transaction in transactions:
+        if transaction.t_type == t_type:
+            key = (transaction.ordinal, transaction.category)
+            totals[key] = totals.get(key, 0) + transaction.cents
+    return totals
+
+
+def merge(partials: Iterable[Mapping[tuple[int, str], int]]) -> DailyTotals:
+    # Partitions are merged in date order, so categories keep their order of first appearance
+    merged: DailyTotals = {}
+    for partial in partials:
+        for key, cents in partial.items():
+            merged[key] = merged.get(key, 0) + cents
+    return merged
+
+
+def fold(totals: Mapping[tuple[int, str], int], start: date, end: date,
+         group_by: str) -> dict[date, list[tuple[str, float]]]:
+    # Rolls day totals up into periods; every period in range is present, even without data
+    summary: dict[date, dict[str, int]] = {period: {} for period in periods(start, end, group_by)}
+    starts: dict[int, date] = {}
+    for (ordinal, category), cents in totals.items():
+        period = starts.get(ordinal)
+        if period is None:
+            period = starts[ordinal] = period_start(date.fromordinal(ordinal), group_by)
+        categories = summary[period]
+        categories[category] = categories.get(category, 0) + cents
+
+    return {period: [(category, cents / 100) for category, cents
+                     in sorted(categories.items(), key=lambda x: x[1], reverse=True)]
+            for period, categories in summary.items()}
+
+
+def can_fork() -> bool:
+    from multiprocessing import get_all_start_methods
+
+    return "fork" in get_all_start_methods()
+
+
+def default_workers(rows: int) -> int:
+    return (os.cpu_count() or 1) if rows >= PARALLEL_MIN_ROWS else 1
+
+
+# Ledger handed to forked workers: they inherit it from the parent instead of receiving a pickled copy
+_shared: tuple[Mapping[int, Transaction | TransactionRecord], Sequence[int]] | None = None
+
+
+def _scan_partition(t_type: str, start: int, end: int) -> DailyTotals:
+    by_id, ids = _shared
+    return daily_totals(map(by_id.__getitem__, ids[start:end]), t_type)
+
+
+def parallel_daily_totals(by_id: Mapping[int, Transaction | TransactionRecord], ids: Sequence[int], t_type: str,
+                          workers: int) -> DailyTotals:
+    # ids are sorted by date, so equal slices are contiguous date ranges with the same number of rows.
+    # The process pool is imported here: it is slow to import and most sessions never need it
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import get_context
+
+    global _shared
+    bounds = [len(ids) * part // workers for part in range(workers + 1)]
+    _shared = (by_id, ids)
+    try:
+        with ProcessPoolExecutor(workers, mp_context=get_context("fork")) as pool:
+            return merge(pool.map(_scan_partition, repeat(t_type), bounds[:-1], bounds[1:]))
+    finally:
+        _shared = None
+
+
+def _sqlite_partition(filename: str, t_type: str, ordinal_from: int, ordinal_to: int) -> DailyTotals:
+    from storage import SqliteBackend
+
+    backend = SqliteBackend(filename)
+    try:
+        return backend.daily_totals(t_type, ordinal_from, ordinal_to)
+    finally:
+        backend.close()
+
+
+def parallel_sqlite_totals(filename: str, t_type: str, start: date, end: date, workers: int) -> DailyTotals:
+    # Each worker opens its own connection and aggregates one date range with an index range scan
+    from concurrent.futures import ProcessPoolExecutor
+
+    first, last = start.toordinal(), end.toordinal()
+    days = last - first + 1
+    bounds = [first + days * part // workers for part in range(workers + 1)]
+    with ProcessPoolExecutor(workers) as pool:
+        return merge(pool.map(_sqlite_partition, repeat(filename), repeat(t_type), bounds[:-1],
+                              [bound - 1 for bound in bounds[1:]]))
@@ -0,0 +1,41 @@
+# Ten-year report by category, single pass vs. partitioned across worker processes. In memory,
+# monthly reports are read from the summary cube, so the weekly report is the one that scans rows.
+# Scaling shows with large ledgers on a multi-core machine, e.g.:
+#   pytest benchmarks/bench_aggregation.py --bench-rows 10000000
+import os
+
+from datetime import date
+
+import pytest
+
+from conftest import Benchmark
+from manager import FinanceManager
+
+START, END = date(2015, 1, 1), date(2024, 12, 31)
+WORKERS = sorted({1, 2, 4, os.cpu_count() or 1})
+
+
+@pytest.fixture(scope="session")
+def report_managers(ledger_file: str, sqlite_file: str) -> dict[str, FinanceManager]:
+    return {"lista": FinanceManager(ledger_file), "sqlite": FinanceManager(sqlite_file)}
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+@pytest.mark.parametrize("group_by", ["month", "week"])
+@pytest.mark.parametrize("mode", ["lista", "sqlite"])
+def test_summary_range(benchmark: Benchmark, report_managers: dict[str, FinanceManager], mode: str,
+                       group_by: str, workers: int) -> None:
+    summary = benchmark(report_managers[mode].summary_range, START, END, group_by, workers=workers)
+    benchmark.extra_info["workers"] = workers
+    assert len(summary) == (120 if group_by == "month" else 523)
+
+
+def test_month_by_month(benchmark: Benchmark, ledger_file: str) -> None:
+    # The same report as 120 separate monthly summaries, for reference
+    manager = FinanceManager(ledger_file)
+
+    def report() -> list[list[tuple[str, float]]]:
+        return [manager.get_monthly_summary_by_category(month, year)
+                for year in range(START.year, END.year + 1) for month in range(1, 13)]
+
+    benchmark(report)
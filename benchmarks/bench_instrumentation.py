@@ -0,0 +1,56 @@
+# Cost of the instrumentation layer. Off (the default) must cost nothing measurable: the manager keeps
+# its plain methods, so these timings are compared against the baseline like any other operation.
+# On, every call pays for two counter snapshots and a perf_counter pair.
+import time
+
+from collections.abc import Callable
+from datetime import date
+from typing import Any
+
+import pytest
+
+from conftest import Benchmark
+from manager import OPERATIONS, FinanceManager
+
+CALLS = 1000
+
+WORKLOADS: dict[str, Callable[[FinanceManager], Any]] = {
+    "buscar_id": lambda manager: [manager.find_transaction_by_id(transaction_id) for transaction_id in range(1, CALLS + 1)],
+    "balance_al_dia": lambda manager: [manager.balance_at(date(2020, 6, day % 28 + 1)) for day in range(CALLS)],
+    "filtro_semana": lambda manager: manager.filter_transactions(date_from=date(2020, 3, 2), date_to=date(2020, 3, 8)),
+    "resumen_mensual": lambda manager: manager.get_monthly_summary_by_category(6, 2020),
+}
+MAX_ENABLED_OVERHEAD_SECONDS = 5e-6
+
+
+@pytest.fixture(scope="session")
+def instrumented(ledger_file: str) -> dict[bool, FinanceManager]:
+    managers = {instrument: FinanceManager(ledger_file, instrument=instrument) for instrument in (False, True)}
+    for manager in managers.values():
+        manager.warm_up()
+    return managers
+
+
+@pytest.mark.parametrize("instrument", [False, True], ids=["apagado", "encendido"])
+@pytest.mark.parametrize("workload", WORKLOADS)
+def test_workload(benchmark: Benchmark, instrumented: dict[bool, FinanceManager], workload: str,
+                  instrument: bool) -> None:
+    manager = instrumented[instrument]
+    if not instrument:
+        assert not set(OPERATIONS) & set(vars(manager))
+    benchmark(WORKLOADS[workload], manager)
+
+
+def test_overhead_per_call(benchmark: Benchmark, instrumented: dict[bool, FinanceManager]) -> None:
+    # Per-call price of a cheap operation with the layer on, next to the same manager with it off
+    def per_call(manager: FinanceManager) -> float:
+        started = time.perf_counter()
+        WORKLOADS["buscar_id"](manager)
+        return (time.perf_counter() - started) / CALLS
+
+    benchmark(WORKLOADS["buscar_id"], instrumented[False])
+    disabled = min(per_call(instrumented[False]) for _ in range(20))
+    enabled = min(per_call(instrumented[True]) for _ in range(20))
+    benchmark.extra_info["disabled_ns"] = disabled * 1e9
+    benchmark.extra_info["enabled_ns"] = enabled * 1e9
+    assert enabled - disabled < MAX_ENABLED_OVERHEAD_SECONDS
@@ -0,0 +1,78 @@
+# Bytes per transaction held in memory, before and after the compact Transaction layout.
+# Runs with the rest of the suite, or standalone: python benchmarks/bench_memory.py [rows]
+import json
+import sys
+import tracemalloc
+
+from datetime import date, datetime
+from os.path import dirname
+from typing import Any
+
+sys.path.insert(0, dirname(dirname(__file__)))
+
+from ledger import iter_ledger
+from models import Transaction
+
+
+class LegacyTransaction:
+    # Layout of models.Transaction before __slots__ (per-instance __dict__, one date object per row)
+
+    def __init__(self, t_type: str, amount: float, category: str, description: str | None = None, transaction_date: date | None = None) -> None:
+        self.id: int = -1
+        self.t_type: str = t_type
+        self.amount: float = amount
+        self.category: str = category.lower()
+        self.description: str | None = description.lower() if description else None
+        self.transaction_date = transaction_date or date.today()
+
+
+def ledger_rows(rows: int) -> list[dict[str, Any]]:
+    # Round-trip through JSON so every string is a fresh object, as after loading a file
+    return json.loads(json.dumps(list(iter_ledger(rows))))
+
+
+def build(cls: type, data: list[dict[str, Any]]) -> list[Any]:
+    transactions = []
+    for transaction_data in data:
+        transaction = cls(
+            transaction_data["t_type"],
+            transaction_data["amount"],
+            transaction_data["category"],
+            transaction_data["description"],
+            datetime.strptime(transaction_data["transaction_date"], "%d/%m/%y").date()
+        )
+        transaction.id = transaction_data["id"]
+        transactions.append(transaction)
+    return transactions
+
+
+def bytes_per_transaction(cls: type, data: list[dict[str, Any]]) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    transactions = build(cls, data)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(transactions)
+
+
+def test_transaction_memory(benchmark, rows: int) -> None:
+    data = ledger_rows(rows)
+    benchmark(build, Transaction, data)
+    benchmark.extra_info["bytes_per_transaction"] = bytes_per_transaction(Transaction, data)
+    benchmark.extra_info["legacy_bytes_per_transaction"] = bytes_per_transaction(LegacyTransaction, data)
+
+
+def main() -> None:
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    data = ledger_rows(rows)
+
+    legacy = bytes_per_transaction(LegacyTransaction, data)
+    compact = bytes_per_transaction(Transaction, data)
+
+    print(f"Transacciones: {rows:,}")
+    print(f"Antes:   {legacy:8.1f} bytes/transacción")
+    print(f"Después: {compact:8.1f} bytes/transacción ({1 - compact / legacy:.0%} menos)")
+
+
+if __name__ == "__main__":
+    main()
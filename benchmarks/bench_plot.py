@@ -0,0 +1,20 @@
+import pytest
+
+from conftest import Benchmark
+from manager import FinanceManager
+
+
+@pytest.mark.parametrize("image_format", ["png", "svg"])
+def test_plot_monthly_summary(benchmark: Benchmark, ledger_file: str, image_format: str) -> None:
+    # chart_cache_size=0 keeps nothing, so every round computes the summary and draws the figure
+    manager = FinanceManager(ledger_file, chart_cache_size=0)
+    image = benchmark(manager.plot_monthly_summary_by_category, 6, 2020, image_format=image_format)
+    benchmark.extra_info["bytes"] = len(image)
+
+
+@pytest.mark.parametrize("image_format", ["png", "svg"])
+def test_plot_cached(benchmark: Benchmark, ledger_file: str, image_format: str) -> None:
+    # Repeat views of a month that did not change
+    manager = FinanceManager(ledger_file)
+    image = benchmark(manager.plot_monthly_summary_by_category, 6, 2020, image_format=image_format)
+    benchmark.extra_info["bytes"] = len(image)
@@ -0,0 +1,68 @@
+from datetime import date
+
+import pytest
+
+from conftest import Benchmark
+from manager import FinanceManager
+
+QUERIES = {
+    "semana": {"date_from": date(2020, 3, 2), "date_to": date(2020, 3, 8)},
+    "anio": {"date_from": date(2020, 1, 1), "date_to": date(2020, 12, 31)},
+    "categoria": {"category": "salud"},
+    "tipo": {"t_type": "Ingreso"},
+    "combinado": {"category": "comida", "t_type": "Gasto", "date_from": date(2019, 1, 1), "date_to": date(2019, 6, 30)},
+}
+MODES = ["lista", "columnar", "sqlite"]
+
+
+@pytest.fixture(scope="session")
+def managers(ledger_file: str, sqlite_file: str) -> dict[str, FinanceManager]:
+    return {
+        "lista": FinanceManager(ledger_file),
+        "columnar": FinanceManager(ledger_file, columnar=True),
+        "sqlite": FinanceManager(sqlite_file),
+    }
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("mode", MODES)
+def test_filter(benchmark: Benchmark, managers: dict[str, FinanceManager], mode: str, query: str) -> None:
+    results = benchmark(managers[mode].filter_transactions, **QUERIES[query])
+    benchmark.extra_info["results"] = len(results)
+
+
+@pytest.mark.parametrize("mode", MODES)
+def test_monthly_summary(benchmark: Benchmark, managers: dict[str, FinanceManager], mode: str) -> None:
+    summary = benchmark(managers[mode].get_monthly_summary_by_category, 6, 2020)
+    assert dict(summary) == pytest.approx(managers["lista"]._scan_monthly_summary(6, 2020))
+
+
+def test_balance_at(benchmark: Benchmark, managers: dict[str, FinanceManager]) -> None:
+    manager = managers["lista"]
+    days = [date(2015 + i % 10, i % 12 + 1, i % 28 + 1) for i in range(1000)]
+    benchmark(lambda: [manager.balance_at(day) for day in days])
+    benchmark.extra_info["queries"] = len(days)
+
+
+@pytest.mark.parametrize("group_by", ["day", "week", "month"])
+def test_balance_series(benchmark: Benchmark, managers: dict[str, FinanceManager], group_by: str) -> None:
+    series = benchmark(managers["lista"].balance_series, date(2015, 1, 1), date(2024, 12, 31), group_by)
+    benchmark.extra_info["points"] = len(series)
+
+
+SEARCHES = ["netflix", "uber OR taxi", "super*", "cine -netflix", "curso online"]
+
+
+@pytest.mark.parametrize("query", SEARCHES)
+def test_search(benchmark: Benchmark, managers: dict[str, FinanceManager], query: str) -> None:
+    manager = managers["lista"]
+    manager.search("netflix")  # the text index is built on the first search
+    results = benchmark(manager._ensure_searchable().search, query)
+    benchmark.extra_info["results"] = len(results)
+
+
+def test_search_transactions(benchmark: Benchmark, managers: dict[str, FinanceManager]) -> None:
+    # Materializing every match in ledger order, as search() returns it
+    manager = managers["lista"]
+    results = benchmark(manager.search, "cine -netflix")
+    benchmark.extra_info["results"] = len(results)
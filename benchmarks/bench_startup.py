@@ -0,0 +1,29 @@
+# Cold import of manager, as paid by every `python main.py` launch. Each round runs a fresh
+# interpreter with -X importtime and reads the cumulative time reported for the manager module.
+import subprocess
+import sys
+
+from os.path import dirname
+
+from conftest import Benchmark
+
+MAX_IMPORT_SECONDS = 0.05
+
+
+def import_seconds(module: str) -> float:
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True, check=True, cwd=dirname(dirname(__file__)))
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    for line in result.stderr.splitlines():
+        _, _, columns = line.partition("import time:")
+        fields = [field.strip() for field in columns.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            return int(fields[1]) / 1_000_000
+    raise RuntimeError(f"-X importtime no reportó el módulo {module}")
+
+
+def test_import_manager(benchmark: Benchmark) -> None:
+    benchmark(import_seconds, "manager")
+    seconds = min(import_seconds("manager") for _ in range(5))
+    benchmark.extra_info["import_seconds"] = seconds
+    assert seconds < MAX_IMPORT_SECONDS
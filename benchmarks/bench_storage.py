@@ -0,0 +1,34 @@
+import shutil
+
+from conftest import Benchmark
+from manager import FinanceManager
+from models import Transaction
+
+
+def test_load_json(benchmark: Benchmark, ledger_file: str, rows: int) -> None:
+    manager = benchmark(FinanceManager, ledger_file)
+    assert len(manager) == rows
+
+
+def test_load_sqlite(benchmark: Benchmark, sqlite_file: str, rows: int) -> None:
+    manager = benchmark(FinanceManager, sqlite_file)
+    assert len(manager) == rows
+
+
+def test_save_json(benchmark: Benchmark, ledger_file: str, tmp_path) -> None:
+    manager = FinanceManager(ledger_file)
+    manager.filename = str(tmp_path / "transactions.json")
+    benchmark(manager.save_to_file)
+
+
+def test_save_journaled_change(benchmark: Benchmark, ledger_file: str, tmp_path) -> None:
+    # One new transaction per save: the cost should not depend on the ledger size
+    filename = str(tmp_path / "transactions.json")
+    shutil.copy(ledger_file, filename)
+    manager = FinanceManager(filename, journaled=True, compact_threshold=10 ** 9)
+
+    def add_and_save() -> None:
+        manager.add_transaction(Transaction("Gasto", 10, "comida"), show_message=False)
+        manager.save_to_file()
+
+    benchmark(add_and_save)
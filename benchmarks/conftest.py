@@ -0,0 +1,140 @@
+# Benchmark harness: a pytest-benchmark-style `benchmark` fixture that records wall time and peak
+# memory per operation, writes results.json and compares every run against baseline.json.
+#
+#   pytest benchmarks                                  # 1k and 100k rows
+#   pytest benchmarks --bench-rows 1000,1000000,5000000
+#   pytest benchmarks --bench-save                     # store this run as the new baseline
+#   pytest benchmarks --bench-strict                   # fail the run when something regressed
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+
+from collections.abc import Callable
+from os.path import dirname, exists, join
+from typing import Any
+
+import pytest
+
+sys.path.insert(0, dirname(dirname(__file__)))
+
+from ledger import write_json_ledger
+from storage import JsonBackend, SqliteBackend, migrate
+
+BASELINE_FILE = join(dirname(__file__), "baseline.json")
+RESULTS_FILE = join(dirname(__file__), "results.json")
+
+_results: dict[str, dict[str, Any]] = {}
+_regressions: list[str] = []
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmarks")
+    group.addoption("--bench-rows", default="1000,100000",
+                    help="tamaños del libro sintético, separados por comas (por defecto: 1000,100000)")
+    group.addoption("--bench-rounds", type=int, default=3, help="repeticiones cronometradas por operación")
+    group.addoption("--bench-tolerance", type=float, default=0.25,
+                    help="cuánto más lento o pesado que la línea base se marca como regresión (0.25 = 25%%)")
+    group.addoption("--bench-save", action="store_true", help="guardar esta corrida como nueva línea base")
+    group.addoption("--bench-strict", action="store_true", help="fallar la corrida si hay regresiones")
+
+
+def pytest_generate_tests(metafunc: pytest.Metafunc) -> None:
+    if "rows" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("--bench-rows").split(",")]
+        metafunc.parametrize("rows", sizes, scope="session")
+
+
+class Benchmark:
+    def __init__(self, name: str, rounds: int) -> None:
+        self.name: str = name
+        self.rounds: int = rounds
+        self.extra_info: dict[str, Any] = {}
+        self.stats: dict[str, Any] | None = None
+
+    def __call__(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        # The first call is traced for peak memory and doubles as a warm-up, so it is not timed
+        tracemalloc.start()
+        result = func(*args, **kwargs)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        times = []
+        for _ in range(self.rounds):
+            started = time.perf_counter()
+            result = func(*args, **kwargs)
+            times.append(time.perf_counter() - started)
+
+        self.stats = {
+            "min": min(times),
+            "median": statistics.median(times),
+            "rounds": self.rounds,
+            "peak_memory": peak_memory,
+        }
+        return result
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    bench = Benchmark(request.node.nodeid.split("::", 1)[-1], request.config.getoption("--bench-rounds"))
+    yield bench
+    if bench.stats is not None:
+        _results[bench.name] = {**bench.stats, **bench.extra_info}
+
+
+@pytest.fixture(scope="session")
+def ledger_file(rows: int, tmp_path_factory: pytest.TempPathFactory) -> str:
+    path = str(tmp_path_factory.mktemp("ledger") / f"transactions_{rows}.json")
+    write_json_ledger(path, rows)
+    return path
+
+
+@pytest.fixture(scope="session")
+def sqlite_file(ledger_file: str) -> str:
+    path = ledger_file.replace(".json", ".db")
+    migrate(JsonBackend(ledger_file), SqliteBackend(path))
+    return path
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    if not _results:
+        return
+
+    with open(RESULTS_FILE, "w", encoding="utf-8") as results_file:
+        json.dump(_results, results_file, indent=4)
+
+    tolerance = session.config.getoption("--bench-tolerance")
+    if exists(BASELINE_FILE) and not session.config.getoption("--bench-save"):
+        with open(BASELINE_FILE, "r", encoding="utf-8") as baseline_file:
+            baseline: dict[str, dict[str, Any]] = json.load(baseline_file)
+        for name, stats in _results.items():
+            reference = baseline.get(name)
+            if reference is None:
+                continue
+            for metric in ("median", "peak_memory"):
+                if reference[metric] and stats[metric] > reference[metric] * (1 + tolerance):
+                    _regressions.append(f"{name}: {metric} {stats[metric] / reference[metric] - 1:+.0%}")
+
+    if session.config.getoption("--bench-save"):
+        with open(BASELINE_FILE, "w", encoding="utf-8") as baseline_file:
+            json.dump(_results, baseline_file, indent=4)
+
+    if _regressions and session.config.getoption("--bench-strict"):
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter: Any, exitstatus: int, config: pytest.Config) -> None:
+    if not _results:
+        return
+
+    terminalreporter.section("benchmarks")
+    terminalreporter.write_line(f"{'operación':<60} {'mediana':>12} {'mínimo':>12} {'memoria pico':>14}")
+    for name, stats in _results.items():
+        terminalreporter.write_line(f"{name:<60} {stats['median'] * 1000:>10.2f}ms {stats['min'] * 1000:>10.2f}ms "
+                                    f"{stats['peak_memory'] / 2 ** 20:>11.1f} MB")
+
+    for regression in _regressions:
+        terminalreporter.write_line(f"REGRESIÓN {regression}", red=True)
+    if config.getoption("--bench-save"):
+        terminalreporter.write_line(f"Línea base guardada en {BASELINE_FILE}")
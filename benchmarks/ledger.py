@@ -0,0 +1,68 @@
+# Synthetic ledgers with a realistic mix of categories, amounts and dates, for the benchmark suite
+import json
+import random
+
+from collections.abc import Iterator
+from datetime import date
+from typing import Any
+
+# Category -> (share of expenses, median amount, descriptions)
+EXPENSES: dict[str, tuple[float, float, list[str]]] = {
+    "comida": (0.34, 25, ["supermercado", "almuerzo", "restaurante", "cafe", "panaderia"]),
+    "transporte": (0.16, 8, ["uber", "bus", "gasolina", "taxi", "peaje"]),
+    "ocio": (0.12, 30, ["cine", "netflix", "spotify", "bar", "concierto"]),
+    "hogar": (0.10, 80, ["arriendo", "ferreteria", "muebles", "limpieza"]),
+    "servicios": (0.08, 60, ["luz", "agua", "internet", "celular", "gas"]),
+    "salud": (0.06, 50, ["farmacia", "consulta", "laboratorio"]),
+    "ropa": (0.06, 60, ["zapatos", "camisa", "chaqueta"]),
+    "educacion": (0.04, 150, ["matricula", "libros", "curso online"]),
+    "regalos": (0.04, 40, ["cumpleaños", "navidad"]),
+}
+INCOMES: dict[str, tuple[float, float, list[str]]] = {
+    "salario": (0.7, 3000, ["nomina", "prima"]),
+    "ventas": (0.2, 200, ["mercado libre", "venta usado"]),
+    "intereses": (0.1, 15, ["cuenta de ahorros"]),
+}
+INCOME_SHARE = 0.08
+
+
+def iter_ledger(rows: int, seed: int = 0, years: int = 10, last_day: date = date(2024, 12, 31)) -> Iterator[dict[str, Any]]:
+    # Yields transactions in the transactions.json format, ids 1..rows, in date order
+    generator = random.Random(seed)
+    expense_names = list(EXPENSES)
+    expense_weights = [share for share, _, _ in EXPENSES.values()]
+    income_names = list(INCOMES)
+    income_weights = [share for share, _, _ in INCOMES.values()]
+
+    last_ordinal = last_day.toordinal()
+    first_ordinal = last_ordinal - 365 * years
+    ordinals = sorted(generator.randint(first_ordinal, last_ordinal) for _ in range(rows))
+
+    for transaction_id, ordinal in enumerate(ordinals, 1):
+        if generator.random() < INCOME_SHARE:
+            t_type = "Ingreso"
+            category = generator.choices(income_names, income_weights)[0]
+            _, median, descriptions = INCOMES[category]
+        else:
+            t_type = "Gasto"
+            category = generator.choices(expense_names, expense_weights)[0]
+            _, median, descriptions = EXPENSES[category]
+
+        yield {
+            "id": transaction_id,
+            "t_type": t_type,
+            "amount": round(median * generator.lognormvariate(0, 0.6), 2),
+            "category": category,
+            "description": generator.choice(descriptions) if generator.random() < 0.7 else None,
+            "transaction_date": date.fromordinal(ordinal).strftime("%d/%m/%y"),
+        }
+
+
+def write_json_ledger(path: str, rows: int, seed: int = 0) -> None:
+    # Same layout as json.dump(..., indent=4), written incrementally so millions of rows fit in memory
+    with open(path, "w", encoding="utf-8") as json_file:
+        json_file.write("[")
+        for position, transaction_data in enumerate(iter_ledger(rows, seed)):
+            item = json.dumps(transaction_data, ensure_ascii=False, indent=4).replace("\n", "\n    ")
+            json_file.write(f"{',' if position else ''}\n    {item}")
+        json_file.write("\n]" if rows else "]")
@@ -0,0 +1,105 @@
+# Load test for server.py: N keep-alive connections send a mix of reads and writes for a fixed time
+# and the requests per second and latency percentiles are reported per kind of request.
+#
+#   python benchmarks/load_test.py                          # starts its own instance on a 100k-row ledger
+#   python benchmarks/load_test.py --rows 1000000 --connections 64 --writes 0.2
+#   python benchmarks/load_test.py --port 8765              # against an instance that is already running
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from os.path import dirname, join
+
+sys.path.insert(0, dirname(dirname(__file__)))
+
+from ledger import write_json_ledger
+from manager import FinanceManager
+from server import Client, FinanceService
+
+READS = {
+    "balance": lambda generator: "/balance",
+    "summary": lambda generator: f"/summary?month={generator.randint(1, 12)}&year={generator.randint(2015, 2024)}",
+    "filtro": lambda generator: "/transactions?category=comida&from={0}&to={0}".format(
+        f"{generator.randint(1, 28):02d}/{generator.randint(1, 12):02d}/{generator.randint(15, 24)}"),
+    "busqueda": lambda generator: "/transactions?q=uber+OR+taxi&from=01/12/24",
+}
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def connection(port: int, host: str, duration: float, writes: float, seed: int,
+                     latencies: dict[str, list[float]], errors: list[int]) -> None:
+    generator = random.Random(seed)
+    client = Client(host, port)
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            if generator.random() < writes:
+                kind, method, data = "alta", "POST", {
+                    "t_type": "Gasto", "amount": round(generator.uniform(1, 100), 2), "category": "comida",
+                    "description": "carga", "transaction_date": "31/12/24"}
+                path = "/transactions"
+            else:
+                kind = generator.choice(list(READS))
+                method, path, data = "GET", READS[kind](generator), None
+
+            started = time.perf_counter()
+            status, _ = await client.request(method, path, data)
+            latencies.setdefault(kind, []).append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        await client.close()
+
+
+async def load(port: int, host: str, connections: int, duration: float, writes: float) -> None:
+    latencies: dict[str, list[float]] = {}
+    errors: list[int] = []
+    started = time.perf_counter()
+    await asyncio.gather(*(connection(port, host, duration, writes, seed, latencies, errors)
+                           for seed in range(connections)))
+    elapsed = time.perf_counter() - started
+
+    everything = [latency for values in latencies.values() for latency in values]
+    print(f"{len(everything)} solicitudes en {elapsed:.1f} s con {connections} conexiones: "
+          f"{len(everything) / elapsed:,.0f} solicitudes/s, {len(errors)} errores")
+    print(f"{'tipo':<10} {'solicitudes':>12} {'por segundo':>12} {'p50':>10} {'p99':>10}")
+    for kind, values in sorted(latencies.items()) + [("total", everything)]:
+        print(f"{kind:<10} {len(values):>12} {len(values) / elapsed:>12,.0f} "
+              f"{statistics.median(values) * 1000:>8.2f}ms {percentile(values, 0.99) * 1000:>8.2f}ms")
+
+
+async def main(parsed: argparse.Namespace) -> None:
+    if parsed.port:
+        await load(parsed.port, parsed.host, parsed.connections, parsed.duration, parsed.writes)
+        return
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = join(directory, "transactions.json")
+        write_json_ledger(path, parsed.rows)
+        service = FinanceService(FinanceManager(path, journaled=True, shared=True))
+        await service.start(parsed.host, 0)
+        try:
+            await load(service.port, parsed.host, parsed.connections, parsed.duration, parsed.writes)
+        finally:
+            await service.stop()
+        print(f"{service.writes} escrituras en {service.commits} commits "
+              f"({service.writes / max(service.commits, 1):.1f} por commit)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="instancia ya iniciada; sin esto se levanta una local")
+    parser.add_argument("--rows", type=int, default=100_000, help="tamaño del libro sintético de la instancia local")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10, help="segundos")
+    parser.add_argument("--writes", type=float, default=0.1, help="fracción de solicitudes que son altas")
+    asyncio.run(main(parser.parse_args()))
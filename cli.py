@@ -0,0 +1,230 @@
+# One-shot command line interface for scripts and scheduled jobs. Every subcommand runs a single
+# operation over as many records or ids as it is given, saves and exits:
+#
+#   python cli.py add "Gasto,25.5,comida,almuerzo,15/06/24" "Ingreso,3000,salario,,30/06/24"
+#   python cli.py import extracto.csv --map amount=Monto --map category=Rubro --map transaction_date=Fecha
+#   python cli.py filter --category comida --from 01/06/24 --to 30/06/24 --json
+#   python cli.py filter --search "uber OR taxi"
+#   python cli.py summary 06/2024 07/2024
+#   python cli.py update 3 7 9 --category ocio
+#   python cli.py delete 3 7 9
+#   python cli.py balance
+import argparse
+import csv
+import json
+import sys
+
+from collections.abc import Iterable
+from datetime import date, datetime
+
+from manager import FinanceManager
+from models import Transaction, is_valid_amount
+
+RECORD_FORMAT = "tipo,monto,categoría[,descripción[,fecha dd/mm/yy]]"
+
+
+def parse_date_argument(text: str) -> date:
+    try:
+        return datetime.strptime(text, "%d/%m/%y").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida: {text} (use dd/mm/yy)")
+
+
+def parse_month_argument(text: str) -> tuple[int, int]:
+    try:
+        month, year = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mes inválido: {text} (use mm/aaaa)")
+    if not 1 <= month <= 12 or year <= 0:
+        raise argparse.ArgumentTypeError(f"mes inválido: {text} (use mm/aaaa)")
+    return month, year
+
+
+def parse_record(fields: list[str]) -> Transaction:
+    # Same rules as the interactive menu: known type, positive amount, category required
+    if not 3 <= len(fields) <= 5:
+        raise ValueError(f"se esperaba {RECORD_FORMAT}")
+    t_type, amount_text, category, description, date_text = [field.strip() for field in fields] + [""] * (5 - len(fields))
+
+    t_type = t_type.capitalize()
+    if t_type not in ("Gasto", "Ingreso"):
+        raise ValueError(f"tipo inválido: {t_type}")
+    try:
+        amount = float(amount_text)
+    except ValueError:
+        raise ValueError(f"monto inválido: {amount_text}")
+    if not is_valid_amount(amount):
+        raise ValueError("el monto debe ser positivo")
+    if not category:
+        raise ValueError("falta la categoría")
+    try:
+        transaction_date = datetime.strptime(date_text, "%d/%m/%y").date() if date_text else None
+    except ValueError:
+        raise ValueError(f"fecha inválida: {date_text}")
+
+    return Transaction(t_type, amount, category, description or None, transaction_date)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli.py", description="Administrador de finanzas personales")
+    parser.add_argument("-f", "--file", default="transactions.json",
+                        help="archivo de transacciones (.json, o .db/.sqlite para SQLite)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="agregar transacciones")
+    add.add_argument("records", nargs="*", metavar="REGISTRO", help=f"transacción con formato {RECORD_FORMAT}")
+    add.add_argument("--stdin", action="store_true", help="leer además un registro por línea desde la entrada estándar")
+
+    import_csv = commands.add_parser("import", help="importar archivos CSV")
+    import_csv.add_argument("paths", nargs="+", metavar="CSV")
+    import_csv.add_argument("--map", action="append", default=[], metavar="CAMPO=COLUMNA", dest="mapping",
+                            help="columna del CSV para cada campo (t_type, amount, category, description, "
+                                 "transaction_date)")
+    import_csv.add_argument("--date-format", default="%d/%m/%y")
+    import_csv.add_argument("--delimiter", default=",")
+
+    filter_command = commands.add_parser("filter", help="listar transacciones filtradas")
+    filter_command.add_argument("--category")
+    filter_command.add_argument("--type", dest="t_type")
+    filter_command.add_argument("--from", dest="date_from", type=parse_date_argument, metavar="DD/MM/YY")
+    filter_command.add_argument("--to", dest="date_to", type=parse_date_argument, metavar="DD/MM/YY")
+    filter_command.add_argument("--search", metavar="CONSULTA",
+                                help='búsqueda en descripción y categoría, p. ej. "uber OR taxi", "net*", "-reembolso"')
+    filter_command.add_argument("--json", action="store_true", help="salida en JSON")
+
+    summary = commands.add_parser("summary", help="gastos por categoría de uno o más meses")
+    summary.add_argument("months", nargs="+", type=parse_month_argument, metavar="MM/AAAA")
+    summary.add_argument("--json", action="store_true", help="salida en JSON")
+
+    update = commands.add_parser("update", help="modificar transacciones")
+    update.add_argument("ids", nargs="+", type=int, metavar="ID")
+    update.add_argument("--type", dest="t_type")
+    update.add_argument("--amount", type=float)
+    update.add_argument("--category")
+    update.add_argument("--description")
+    update.add_argument("--date", dest="transaction_date", type=parse_date_argument, metavar="DD/MM/YY")
+
+    delete = commands.add_parser("delete", help="eliminar transacciones")
+    delete.add_argument("ids", nargs="+", type=int, metavar="ID")
+
+    balance = commands.add_parser("balance", help="mostrar el balance")
+    balance.add_argument("--json", action="store_true", help="salida en JSON")
+
+    return parser
+
+
+def add_records(manager: FinanceManager, records: Iterable[str]) -> int:
+    # Nothing is added unless every record is valid, so a failed job can simply be re-run
+    transactions, errors = [], []
+    for number, fields in enumerate(csv.reader(records), 1):
+        try:
+            transactions.append(parse_record(fields))
+        except ValueError as error:
+            errors.append(f"Registro {number}: {error}")
+
+    if errors:
+        print(*errors, sep="\n", file=sys.stderr)
+        return 1
+
+    manager.add_transactions(transactions)
+    print(f"Se agregaron {len(transactions)} transacciones.")
+    return 0
+
+
+def import_files(manager: FinanceManager, arguments: argparse.Namespace) -> int:
+    try:
+        mapping = dict(item.split("=", 1) for item in arguments.mapping)
+    except ValueError:
+        print("Cada --map debe tener la forma CAMPO=COLUMNA", file=sys.stderr)
+        return 2
+
+    status = 0
+    for path in arguments.paths:
+        try:
+            report = manager.import_csv(path, mapping, arguments.date_format, arguments.delimiter)
+        except (OSError, ValueError) as error:
+            print(f"{path}: {error}", file=sys.stderr)
+            status = 1
+            continue
+        print(f"{path}: {report}")
+    return status
+
+
+def run(manager: FinanceManager, arguments: argparse.Namespace) -> int:
+    match arguments.command:
+        case "add":
+            records = list(arguments.records)
+            if arguments.stdin:
+                records.extend(line for line in sys.stdin if line.strip())
+            return add_records(manager, records)
+
+        case "import":
+            return import_files(manager, arguments)
+
+        case "filter":
+            try:
+                results = manager.filter_transactions(arguments.category, arguments.t_type, arguments.date_from,
+                                                      arguments.date_to, arguments.search)
+            except ValueError as error:
+                print(error, file=sys.stderr)
+                return 2
+            if arguments.json:
+                json.dump([t.to_dict() for t in results], sys.stdout, ensure_ascii=False)
+                print()
+            else:
+                print(*results, sep="\n")
+
+        case "summary":
+            summaries = {f"{month:02d}/{year}": manager.get_monthly_summary_by_category(month, year)
+                         for month, year in arguments.months}
+            if arguments.json:
+                json.dump({period: dict(summary) for period, summary in summaries.items()}, sys.stdout,
+                          ensure_ascii=False)
+                print()
+            else:
+                for period, summary in summaries.items():
+                    print(f"\nGastos por categoría - {period}")
+                    print("-" * 35)
+                    for category, amount in summary:
+                        print(f"{category.capitalize():<20} ${amount:,.2f}")
+
+        case "update":
+            fields = {name: getattr(arguments, name) for name in ("t_type", "amount", "category", "description",
+                                                                  "transaction_date")
+                      if getattr(arguments, name) is not None}
+            if not fields:
+                print("No se indicó ningún cambio", file=sys.stderr)
+                return 2
+            try:
+                updated = manager.update_transactions(arguments.ids, **fields)
+            except ValueError as error:
+                print(error, file=sys.stderr)
+                return 1
+            print(f"Se modificaron {len(updated)} de {len(arguments.ids)} transacciones.")
+            return 0 if len(updated) == len(arguments.ids) else 1
+
+        case "delete":
+            deleted = manager.delete_transactions(arguments.ids)
+            print(f"Se eliminaron {len(deleted)} de {len(arguments.ids)} transacciones.")
+            return 0 if len(deleted) == len(arguments.ids) else 1
+
+        case "balance":
+            if arguments.json:
+                print(json.dumps({"balance": manager.balance}))
+            else:
+                manager.display_balance()
+
+    return 0
+
+
+def main(arguments: list[str]) -> int:
+    parsed = build_parser().parse_args(arguments)
+    manager = FinanceManager(parsed.file, journaled=True, shared=True)
+    try:
+        return run(manager, parsed)
+    finally:
+        manager.save_to_file()
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
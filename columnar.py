@@ -0,0 +1,176 @@
+import numpy as np
+
+from collections.abc import Callable, Sequence
+from datetime import date
+
+from models import Transaction, TransactionRecord
+
+
+class ColumnarStore:
+    # Keeps transaction fields in contiguous arrays (amounts as int64 cents) so filters run as boolean
+    # masks and the balance as one integer dot product. Deleted rows are tombstoned and swept out in bulk.
+    # The objects themselves sit in a column too, so a filter picks its results with the same mask
+    # instead of looking each id up.
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.size: int = 0
+        self.ids = np.empty(capacity, dtype=np.int64)
+        self.cents = np.empty(capacity, dtype=np.int64)
+        self.types = np.empty(capacity, dtype=np.int32)
+        self.categories = np.empty(capacity, dtype=np.int32)
+        self.ordinals = np.empty(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.objects = np.empty(capacity, dtype=object)
+        # Rows whose object is still a TransactionRecord, turned into a Transaction when first returned
+        self.records = np.zeros(capacity, dtype=bool)
+
+        # Dictionary encoding for the string columns
+        self.type_names: list[str] = []
+        self.category_names: list[str] = []
+        self._type_codes: dict[str, int] = {}
+        self._category_codes: dict[str, int] = {}
+
+        self._rows: dict[int, int] = {}
+        self._dead: int = 0
+
+    def __len__(self) -> int:
+        return self.size - self._dead
+
+    def _type_code(self, t_type: str) -> int:
+        code = self._type_codes.get(t_type)
+        if code is None:
+            code = self._type_codes[t_type] = len(self.type_names)
+            self.type_names.append(t_type)
+        return code
+
+    def _category_code(self, category: str) -> int:
+        code = self._category_codes.get(category)
+        if code is None:
+            code = self._category_codes[category] = len(self.category_names)
+            self.category_names.append(category)
+        return code
+
+    def _reserve(self, extra: int) -> None:
+        needed = self.size + extra
+        capacity = len(self.ids)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+        for column in ("ids", "cents", "types", "categories", "ordinals", "alive", "objects", "records"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype) if old.dtype != object else np.empty(capacity, dtype=object)
+            new[:self.size] = old[:self.size]
+            setattr(self, column, new)
+
+    def _write_row(self, row: int, transaction: Transaction | TransactionRecord) -> None:
+        self.objects[row] = transaction
+        self.records[row] = isinstance(transaction, TransactionRecord)
+        self.ids[row] = transaction.id
+        self.cents[row] = transaction.cents
+        self.types[row] = self._type_code(transaction.t_type)
+        self.categories[row] = self._category_code(transaction.category)
+        self.ordinals[row] = transaction.ordinal
+        self.alive[row] = True
+
+    def append(self, transaction: Transaction | TransactionRecord) -> None:
+        self._reserve(1)
+        self._write_row(self.size, transaction)
+        self._rows[transaction.id] = self.size
+        self.size += 1
+
+    def extend(self, transactions: Sequence[Transaction | TransactionRecord]) -> None:
+        count = len(transactions)
+        self._reserve(count)
+
+        start, end = self.size, self.size + count
+        self.ids[start:end] = np.fromiter((t.id for t in transactions), dtype=np.int64, count=count)
+        self.cents[start:end] = np.fromiter((t.cents for t in transactions), dtype=np.int64, count=count)
+        self.types[start:end] = np.fromiter((self._type_code(t.t_type) for t in transactions),
+                                            dtype=np.int32, count=count)
+        self.categories[start:end] = np.fromiter((self._category_code(t.category) for t in transactions),
+                                                 dtype=np.int32, count=count)
+        self.ordinals[start:end] = np.fromiter((t.ordinal for t in transactions),
+                                               dtype=np.int32, count=count)
+        self.alive[start:end] = True
+        # fromiter keeps records (tuples) as single objects instead of unpacking them into a 2-D array
+        self.objects[start:end] = np.fromiter(transactions, dtype=object, count=count)
+        self.records[start:end] = np.fromiter((isinstance(t, TransactionRecord) for t in transactions),
+                                              dtype=bool, count=count)
+
+        for row, transaction in enumerate(transactions, start):
+            self._rows[transaction.id] = row
+        self.size = end
+
+    def update(self, transaction: Transaction | TransactionRecord) -> None:
+        # Rewriting in place keeps the row order, so results stay in insertion order
+        self._write_row(self._rows[transaction.id], transaction)
+
+    def remove(self, transaction: Transaction | TransactionRecord) -> None:
+        row = self._rows.pop(transaction.id)
+        self.alive[row] = False
+        self.objects[row] = None
+        self._dead += 1
+
+        if self._dead > 1024 and self._dead * 2 > self.size:
+            self._sweep()
+
+    def _sweep(self) -> None:
+        keep = np.flatnonzero(self.alive[:self.size])
+        for column in ("ids", "cents", "types", "categories", "ordinals", "alive", "objects", "records"):
+            array = getattr(self, column)
+            array[:len(keep)] = array[keep]
+        self.objects[len(keep):self.size] = None
+
+        self.size = len(keep)
+        self.alive[self.size:] = False
+        self._rows = {transaction_id: row for row, transaction_id in enumerate(self.ids[:self.size].tolist())}
+        self._dead = 0
+
+    def _mask(self, category: str | None = None, t_type: str | None = None, ordinal_from: int | None = None,
+              ordinal_to: int | None = None) -> np.ndarray:
+        mask = self.alive[:self.size].copy()
+
+        if category:
+            code = self._category_codes.get(category.lower())
+            if code is None:
+                mask[:] = False
+                return mask
+            mask &= self.categories[:self.size] == code
+
+        if t_type:
+            codes = [code for name, code in self._type_codes.items() if name.lower() == t_type.lower()]
+            if len(codes) == 1:
+                mask &= self.types[:self.size] == codes[0]
+            else:
+                mask &= np.isin(self.types[:self.size], codes)
+
+        if ordinal_from is not None:
+            mask &= self.ordinals[:self.size] >= ordinal_from
+
+        if ordinal_to is not None:
+            mask &= self.ordinals[:self.size] <= ordinal_to
+
+        return mask
+
+    def filter(self, materialize: Callable[[TransactionRecord], Transaction], category: str | None = None,
+               t_type: str | None = None, date_from: date | None = None,
+               date_to: date | None = None) -> list[Transaction]:
+        # Matching transactions in row order; records among them go through materialize once and the
+        # resulting Transaction replaces them in the column
+        rows = np.flatnonzero(self._mask(category, t_type, date_from.toordinal() if date_from else None,
+                                         date_to.toordinal() if date_to else None))
+        pending = rows[self.records[rows]]
+        if len(pending):
+            self.objects[pending] = [materialize(record) for record in self.objects[pending].tolist()]
+            self.records[pending] = False
+        return self.objects[rows].tolist()
+
+    def balance_cents(self) -> int:
+        # Incomes minus expenses over every live row, in one vectorized pass
+        signs = np.zeros(max(len(self.type_names), 1), dtype=np.int64)
+        for name, code in self._type_codes.items():
+            signs[code] = {"Ingreso": 1, "Gasto": -1}.get(name, 0)
+        alive = self.alive[:self.size]
+        return int(np.dot(self.cents[:self.size][alive], signs[self.types[:self.size][alive]]))
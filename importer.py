@@ -0,0 +1,129 @@
+import csv
+import math
+
+from collections import Counter
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from sys import intern
+
+from models import to_cents
+
+# Columns of a transaction that can be read from a CSV file; t_type and description are optional
+IMPORT_FIELDS = ("t_type", "amount", "category", "description", "transaction_date")
+REQUIRED_FIELDS = ("amount", "category", "transaction_date")
+
+MAX_ERROR_EXAMPLES = 20
+
+# t_type, amount in cents, category, description, date
+ImportRow = tuple[str, int, str, str | None, date]
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    seconds: float = 0.0
+    # Error message -> number of rows, plus the first few offending lines for reference
+    errors: Counter[str] = field(default_factory=Counter)
+    examples: list[tuple[int, str]] = field(default_factory=list)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add_error(self, line: int, message: str) -> None:
+        self.errors[message] += 1
+        if len(self.examples) < MAX_ERROR_EXAMPLES:
+            self.examples.append((line, message))
+
+    def __str__(self) -> str:
+        lines = [f"Se importaron {self.imported} de {self.rows} filas en {self.seconds:.2f} s "
+                 f"({self.rows_per_second:,.0f} filas/s)"]
+        for message, count in self.errors.most_common():
+            lines.append(f"  {count} filas: {message}")
+        return "\n".join(lines)
+
+
+def read_csv_batches(path: str, mapping: Mapping[str, str], report: ImportReport, date_format: str = "%d/%m/%y",
+                     delimiter: str = ",", batch_size: int = 10_000) -> Iterator[list[ImportRow]]:
+    # Streams the file and yields validated, normalized rows in batches; invalid rows are recorded in the
+    # report. Without a t_type column the type comes from the sign of the amount, as in bank statements.
+    unknown = set(mapping) - set(IMPORT_FIELDS)
+    if unknown:
+        raise ValueError(f"Campos desconocidos en el mapeo: {', '.join(sorted(unknown))}")
+    missing = [name for name in REQUIRED_FIELDS if name not in mapping]
+    if missing:
+        raise ValueError(f"Faltan columnas en el mapeo: {', '.join(missing)}")
+
+    dates: dict[str, date] = {}
+    batch: list[ImportRow] = []
+
+    with open(path, "r", encoding="utf-8-sig", newline="") as csv_file:
+        reader = csv.DictReader(csv_file, delimiter=delimiter)
+        absent = [column for column in mapping.values() if column not in (reader.fieldnames or ())]
+        if absent:
+            raise ValueError(f"El archivo no tiene las columnas: {', '.join(absent)}")
+
+        type_column = mapping.get("t_type")
+        description_column = mapping.get("description")
+        amount_column = mapping["amount"]
+        category_column = mapping["category"]
+        date_column = mapping["transaction_date"]
+
+        for row in reader:
+            report.rows += 1
+            line = reader.line_num
+            # DictReader fills missing cells with None and puts extra ones under the None key
+            if None in row or None in row.values():
+                report.add_error(line, "fila incompleta")
+                continue
+
+            try:
+                amount = float(row[amount_column].replace("$", "").strip())
+                if not math.isfinite(amount):
+                    raise ValueError(amount)
+            except ValueError:
+                report.add_error(line, "monto inválido")
+                continue
+            cents = to_cents(amount)
+
+            if type_column:
+                t_type = row[type_column].strip().capitalize()
+                if t_type not in ("Gasto", "Ingreso"):
+                    report.add_error(line, "tipo inválido")
+                    continue
+                if cents <= 0:
+                    report.add_error(line, "el monto debe ser positivo")
+                    continue
+            else:
+                if cents == 0:
+                    report.add_error(line, "el monto no puede ser cero")
+                    continue
+                t_type = "Gasto" if cents < 0 else "Ingreso"
+                cents = abs(cents)
+
+            category = row[category_column].strip().lower()
+            if not category:
+                report.add_error(line, "falta la categoría")
+                continue
+
+            date_text = row[date_column].strip()
+            transaction_date = dates.get(date_text)
+            if transaction_date is None:
+                try:
+                    transaction_date = dates[date_text] = datetime.strptime(date_text, date_format).date()
+                except ValueError:
+                    report.add_error(line, "fecha inválida")
+                    continue
+
+            description = row[description_column].strip().lower() if description_column else ""
+            batch.append((intern(t_type), cents, intern(category), intern(description) if description else None,
+                          transaction_date))
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+
+    if batch:
+        yield batch
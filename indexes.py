@@ -0,0 +1,265 @@
+import re
+import unicodedata
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date
+from functools import lru_cache
+from itertools import accumulate
+
+from models import Transaction
+
+
+class TransactionIndex:
+    # Secondary indexes are kept in sync by FinanceManager: `add` after a transaction is stored,
+    # `discard` before it is removed or edited (and `add` again once the edit is done)
+
+    def add(self, transaction: Transaction) -> None:
+        raise NotImplementedError
+
+    def extend(self, transactions: Sequence[Transaction]) -> None:
+        for transaction in transactions:
+            self.add(transaction)
+
+    def discard(self, transaction: Transaction) -> None:
+        raise NotImplementedError
+
+
+class DateIndex(TransactionIndex):
+    # Transaction ids sorted by date, as two parallel arrays so range queries are a pair of bisects
+
+    def __init__(self) -> None:
+        self._ordinals = array("i")
+        self._ids = array("q")
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, transaction: Transaction) -> None:
+        ordinal = transaction.ordinal
+        position = bisect_right(self._ordinals, ordinal)
+        self._ordinals.insert(position, ordinal)
+        self._ids.insert(position, transaction.id)
+
+    def extend(self, transactions: Sequence[Transaction]) -> None:
+        if not transactions:
+            return
+
+        entries = sorted((t.ordinal, t.id) for t in transactions)
+        if self._ordinals and entries[0][0] < self._ordinals[-1]:
+            # Out-of-order batch: merge with what is already indexed in a single sort
+            entries = sorted([*zip(self._ordinals, self._ids), *entries])
+            self._ordinals = array("i")
+            self._ids = array("q")
+
+        self._ordinals.extend(ordinal for ordinal, _ in entries)
+        self._ids.extend(transaction_id for _, transaction_id in entries)
+
+    def discard(self, transaction: Transaction) -> None:
+        ordinal = transaction.ordinal
+        start = bisect_left(self._ordinals, ordinal)
+        end = bisect_right(self._ordinals, ordinal, start)
+        position = self._ids.index(transaction.id, start, end)
+        del self._ordinals[position]
+        del self._ids[position]
+
+    def between(self, date_from: date | None = None, date_to: date | None = None) -> Sequence[int]:
+        start = bisect_left(self._ordinals, date_from.toordinal()) if date_from else 0
+        end = bisect_right(self._ordinals, date_to.toordinal()) if date_to else len(self._ordinals)
+        return self._ids[start:end]
+
+
+class SummaryCube(TransactionIndex):
+    # Running sums (in cents) and counts per (year, month) -> (t_type, category), so monthly
+    # summaries never rescan the ledger
+
+    def __init__(self) -> None:
+        self._cells: dict[tuple[int, int], dict[tuple[str, str], list[int]]] = {}
+
+    def add(self, transaction: Transaction) -> None:
+        transaction_date = transaction.transaction_date
+        month = self._cells.setdefault((transaction_date.year, transaction_date.month), {})
+        cell = month.setdefault((transaction.t_type, transaction.category), [0, 0])
+        cell[0] += transaction.cents
+        cell[1] += 1
+
+    def discard(self, transaction: Transaction) -> None:
+        transaction_date = transaction.transaction_date
+        key = (transaction_date.year, transaction_date.month)
+        month = self._cells[key]
+        cell = month[(transaction.t_type, transaction.category)]
+        cell[0] -= transaction.cents
+        cell[1] -= 1
+
+        # Drop empty cells so months and categories disappear once their last transaction goes
+        if not cell[1]:
+            del month[(transaction.t_type, transaction.category)]
+            if not month:
+                del self._cells[key]
+
+    def cent_totals(self, year: int, month: int, t_type: str) -> dict[str, int]:
+        cells = self._cells.get((year, month), {})
+        return {category: cell[0] for (cell_type, category), cell in cells.items() if cell_type == t_type}
+
+    def totals(self, year: int, month: int, t_type: str) -> dict[str, float]:
+        return {category: cents / 100 for category, cents in self.cent_totals(year, month, t_type).items()}
+
+
+class BalanceIndex(TransactionIndex):
+    # Net signed cents per day ("Ingreso" positive, "Gasto" negative) over sorted days, plus their
+    # running totals, so the balance on any date is one bisect. A change on some day only invalidates
+    # the running totals from that day on; they are brought up to date by one accumulate pass on the
+    # next query.
+
+    def __init__(self) -> None:
+        self._days = array("i")
+        self._net = array("q")
+        self._running = array("q")
+        # Number of leading days whose running total is current
+        self._valid: int = 0
+
+    @staticmethod
+    def _signed(transaction: Transaction) -> int:
+        if transaction.t_type == "Ingreso":
+            return transaction.cents
+        if transaction.t_type == "Gasto":
+            return -transaction.cents
+        return 0
+
+    def _change(self, ordinal: int, cents: int) -> None:
+        position = bisect_left(self._days, ordinal)
+        if position == len(self._days) or self._days[position] != ordinal:
+            self._days.insert(position, ordinal)
+            self._net.insert(position, 0)
+        self._net[position] += cents
+        self._valid = min(self._valid, position)
+
+    def add(self, transaction: Transaction) -> None:
+        self._change(transaction.ordinal, self._signed(transaction))
+
+    def discard(self, transaction: Transaction) -> None:
+        self._change(transaction.ordinal, -self._signed(transaction))
+
+    def extend(self, transactions: Sequence[Transaction]) -> None:
+        net: dict[int, int] = {}
+        for transaction in transactions:
+            net[transaction.ordinal] = net.get(transaction.ordinal, 0) + self._signed(transaction)
+        if not net:
+            return
+
+        if self._days and min(net) <= self._days[-1]:
+            # Batch reaches into indexed days: merge both sides in a single sort
+            for ordinal, cents in zip(self._days, self._net):
+                net[ordinal] = net.get(ordinal, 0) + cents
+            self._days = array("i")
+            self._net = array("q")
+            self._valid = 0
+
+        days = sorted(net)
+        self._days.extend(days)
+        self._net.extend(map(net.__getitem__, days))
+
+    def _refresh(self) -> None:
+        if self._valid == len(self._days):
+            return
+        start = self._valid
+        del self._running[start:]
+        self._running.extend(accumulate(self._net[start:], initial=self._running[start - 1] if start else 0))
+        del self._running[start]
+        self._valid = len(self._days)
+
+    def balance_at(self, day: date) -> int:
+        # Balance in cents at the end of `day`
+        position = bisect_right(self._days, day.toordinal())
+        if not position:
+            return 0
+        self._refresh()
+        return self._running[position - 1]
+
+
+_WORD = re.compile(r"\w+")
+
+
+# Descriptions and categories repeat a lot, so recent strings are only split once; the bound keeps
+# mostly unique descriptions (bank imports) from being held twice for the life of the process
+TOKENIZE_CACHE_SIZE = 1 << 16
+
+
+@lru_cache(maxsize=TOKENIZE_CACHE_SIZE)
+def tokenize(text: str) -> tuple[str, ...]:
+    # Lowercase words without accents, so "Café" and "cafe" match
+    folded = unicodedata.normalize("NFKD", text.lower())
+    return tuple(dict.fromkeys(_WORD.findall("".join(c for c in folded if not unicodedata.combining(c)))))
+
+
+class TextIndex(TransactionIndex):
+    # Inverted index from the words of description and category to transaction ids.
+    # Queries are words separated by spaces, all of which must match; "word*" matches any word with
+    # that prefix, "-word" excludes, and OR joins alternatives: "uber OR taxi -aeropuerto", "net*"
+
+    def __init__(self) -> None:
+        self._postings: dict[str, set[int]] = {}
+        # Sorted vocabulary for prefix lookups, rebuilt on the next query after new words appear
+        self._vocabulary: list[str] | None = []
+
+    @staticmethod
+    def _tokens(transaction: Transaction) -> tuple[str, ...]:
+        if transaction.description:
+            return tokenize(transaction.description) + tokenize(transaction.category)
+        return tokenize(transaction.category)
+
+    def add(self, transaction: Transaction) -> None:
+        for token in self._tokens(transaction):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                self._vocabulary = None
+            postings.add(transaction.id)
+
+    def discard(self, transaction: Transaction) -> None:
+        for token in self._tokens(transaction):
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.discard(transaction.id)
+
+    def _matching(self, term: str) -> set[int]:
+        prefix = term.endswith("*")
+        tokens = tokenize(term)
+        if not tokens:
+            raise ValueError(f"Término de búsqueda vacío: {term!r}")
+
+        # A term that splits into several words ("mercado-libre") needs all of them
+        result = None
+        for position, token in enumerate(tokens):
+            if prefix and position == len(tokens) - 1:
+                ids = self._prefix(token)
+            else:
+                ids = self._postings.get(token, set())
+            result = ids if result is None else result & ids
+        return result
+
+    def _prefix(self, prefix: str) -> set[int]:
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect_left(self._vocabulary, prefix)
+        end = bisect_left(self._vocabulary, prefix + "\U0010ffff", start)
+        return set().union(*(self._postings[token] for token in self._vocabulary[start:end]))
+
+    def search(self, query: str) -> set[int]:
+        matches: set[int] = set()
+        for alternative in re.split(r"\s+OR\s+", query.strip()):
+            included = [term for term in alternative.split() if not term.startswith("-")]
+            excluded = [term[1:] for term in alternative.split() if term.startswith("-") and len(term) > 1]
+            if not included:
+                raise ValueError(f"La búsqueda necesita al menos un término que no sea una exclusión: {query!r}")
+
+            # Intersect from the rarest term so the working set stays small
+            sets = sorted((self._matching(term) for term in included), key=len)
+            result = set(sets[0])
+            for ids in sets[1:]:
+                result &= ids
+            for term in excluded:
+                result -= self._matching(term)
+            matches |= result
+        return matches
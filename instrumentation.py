@@ -0,0 +1,83 @@
+# Opt-in profiling of FinanceManager operations: call counts, wall time, rows scanned and bytes
+# read/written, per public method.
+#
+#   FINANCE_STATS=1 python main.py                 # table on stderr when the process exits
+#   FINANCE_STATS=stats.json python main.py        # JSON file instead
+#   FinanceManager(..., instrument=True).stats()    # collected only; no report at exit without FINANCE_STATS
+#
+# When it is off, nothing is wrapped: the manager runs its plain methods and the only cost left is
+# the row counter the scans bump once per call.
+import atexit
+import json
+import os
+import sys
+
+from collections.abc import Callable
+from functools import wraps
+from time import perf_counter
+from typing import Any
+
+ENV_VAR = "FINANCE_STATS"
+
+FIELDS = ("calls", "seconds", "rows", "bytes_read", "bytes_written")
+
+
+def enabled_by_environment() -> bool:
+    return os.environ.get(ENV_VAR, "") not in ("", "0")
+
+
+class Instrumentation:
+    def __init__(self) -> None:
+        # Operation -> [calls, seconds, rows, bytes_read, bytes_written]. Nested operations (search
+        # calls filter_transactions) are counted in both, like cumulative time in a profiler
+        self._operations: dict[str, list[float]] = {}
+
+    def wrap(self, name: str, method: Callable[..., Any], counters: Callable[[], tuple[int, int, int]]) -> Callable[..., Any]:
+        # counters() returns the running (rows scanned, bytes read, bytes written); the call is
+        # charged the difference
+        totals = self._operations.setdefault(name, [0, 0.0, 0, 0, 0])
+
+        @wraps(method)
+        def instrumented(*args: Any, **kwargs: Any) -> Any:
+            rows, bytes_read, bytes_written = counters()
+            started = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - started
+                rows_after, bytes_read_after, bytes_written_after = counters()
+                totals[0] += 1
+                totals[1] += elapsed
+                totals[2] += rows_after - rows
+                totals[3] += bytes_read_after - bytes_read
+                totals[4] += bytes_written_after - bytes_written
+        return instrumented
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        return {name: dict(zip(FIELDS, totals)) for name, totals in self._operations.items() if totals[0]}
+
+    def reset(self) -> None:
+        for totals in self._operations.values():
+            totals[:] = [0, 0.0, 0, 0, 0]
+
+    def dump(self, target: str | None = None) -> None:
+        # JSON when given a file name, a table on stderr otherwise
+        stats = self.stats()
+        if not stats:
+            return
+
+        if target:
+            with open(target, "w", encoding="utf-8") as stats_file:
+                json.dump(stats, stats_file, indent=4)
+            return
+
+        print(f"\n{'operación':<34} {'llamadas':>9} {'total':>11} {'por llamada':>12} {'filas':>11} "
+              f"{'leídos':>11} {'escritos':>11}", file=sys.stderr)
+        for name, values in sorted(stats.items(), key=lambda item: item[1]["seconds"], reverse=True):
+            print(f"{name:<34} {values['calls']:>9} {values['seconds'] * 1000:>9.1f}ms "
+                  f"{values['seconds'] / values['calls'] * 1000:>10.3f}ms {values['rows']:>11,} "
+                  f"{values['bytes_read']:>11,} {values['bytes_written']:>11,}", file=sys.stderr)
+
+    def dump_at_exit(self) -> None:
+        target = os.environ.get(ENV_VAR, "")
+        atexit.register(self.dump, None if target in ("", "0", "1") else target)
@@ -1,8 +1,12 @@
+import sys
+
 from collections.abc import Callable
 from datetime import datetime
 
+import cli
+
 from manager import FinanceManager
-from models import Transaction
+from models import Transaction, is_valid_amount
 
 def display_menu() -> None:
     print("")
@@ -20,7 +24,7 @@ def display_menu() -> None:
 def main() -> None:
     # Create FinanceManager instance
     filename = input("Nombre del archivo de transacciones (por defecto: transactions.json): ").strip()
-    manager = FinanceManager(filename or "transactions.json")
+    manager = FinanceManager(filename or "transactions.json", journaled=True, shared=True)
 
     try:
         while True:
@@ -40,7 +44,7 @@ def main() -> None:
                     while True:
                         try:
                             amount = float(input(f"Ingrese el monto del {t_type.lower()}: $"))
-                            if amount <= 0:
+                            if not is_valid_amount(amount):
                                 print("Debe ingresar un número positivo.")
                                 continue
                             break
@@ -75,12 +79,12 @@ def main() -> None:
 
                 # Edit/delete transaction
                 case 5|6:
-                    if not manager.transactions:
+                    if not len(manager):
                         print("Actualmente no hay transacciones.")
                         continue
 
-                    action: Callable[[
-                        int], Transaction | None] = manager.edit_transaction if choice == 5 else manager.delete_transaction
+                    action: Callable[[int], Transaction | None] = manager.edit_transaction if choice == 5 else (
+                        lambda transaction_id: manager.delete_transaction(transaction_id, confirm=True))
                     while True:
                         try:
                             transaction_id = int(input("Ingrese el ID de la transacción: "))
@@ -119,5 +123,8 @@ def main() -> None:
         manager.save_to_file()
 
 if __name__ == "__main__":
+    # With arguments it runs a single CLI command (python main.py summary 06/2024), without them the menu
+    if len(sys.argv) > 1:
+        sys.exit(cli.main(sys.argv[1:]))
     main()
 
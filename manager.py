@@ -1,165 +1,632 @@
-import json
-import matplotlib.pyplot as plt
-import numpy as np
-
-from datetime import date, datetime
-from os.path import exists
-from typing import Any
+import gc
+
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import AbstractContextManager, nullcontext
+from datetime import date, datetime, timedelta
+from os.path import splitext
+from functools import wraps
+from sys import intern
+from threading import RLock
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+import aggregation
+import instrumentation
+
+from importer import ImportReport, read_csv_batches
+from indexes import BalanceIndex, DateIndex, SummaryCube, TextIndex, TransactionIndex
+from models import Transaction, TransactionRecord, is_valid_amount
+from storage import Changes, StorageBackend, open_backend
+
+if TYPE_CHECKING:
+    from columnar import ColumnarStore
+    from plotting import ChartCache
+
+# Fields that update_transaction can change
+EDITABLE_FIELDS = ("t_type", "amount", "category", "description", "transaction_date")
+
+# Public operations: they run under the instance lock in thread-safe mode and are measured when instrumented
+OPERATIONS = (
+    "load_from_file", "reload", "warm_up", "sync", "save_to_file", "compact", "add_transaction", "add_transactions",
+    "import_csv", "find_transaction_by_id", "update_transaction", "update_transactions", "delete_transaction",
+    "delete_transactions", "verify_balance", "balance_at", "balance_series", "filter_transactions", "search",
+    "get_monthly_summary_by_category", "summary_range", "plot_monthly_summary_by_category",
+)
+
+
+def _ledger_cents(transactions: Iterable[Transaction | TransactionRecord]) -> int:
+    # Incomes minus expenses, in cents
+    cents = 0
+    for transaction in transactions:
+        if transaction.t_type == "Gasto":
+            cents -= transaction.cents
+        elif transaction.t_type == "Ingreso":
+            cents += transaction.cents
+    return cents
 
-from models import Transaction
 
 class FinanceManager:
-    def __init__(self, filename: str = "transactions.json") -> None:
+    def __init__(self, filename: str = "transactions.json", journaled: bool = False,
+                 compact_threshold: int = 1000, columnar: bool = False, debug: bool = False,
+                 shared: bool = False, thread_safe: bool = False, chart_cache_size: int = 32,
+                 chart_cache_dir: str | None = None, instrument: bool | None = None) -> None:
         self.filename: str = filename
-        self.transactions: list[Transaction] = []
+        # Transactions are stored by id (dicts keep insertion order); the list view is rebuilt lazily.
+        # Rows read from disk stay as records until something asks for the Transaction
+        self._by_id: dict[int, Transaction | TransactionRecord] = {}
+        self._transactions: list[Transaction] | None = []
         self.next_id: int = 1
-        self.balance: float = 0.0
+        # Kept in integer cents so it never drifts; `balance` is the amount it stands for
+        self._balance_cents: int = 0
+        # Storage is picked from the file extension (.db/.sqlite -> SQLite, anything else -> JSON).
+        # In journaled JSON mode every change is appended to a log next to the snapshot,
+        # and the log is folded back into the snapshot once it grows past the threshold
+        self.journaled: bool = journaled
+        self.compact_threshold: int = compact_threshold
+        self._storage: StorageBackend | None = None
+        # Optional NumPy-backed mirror of the ledger used for vectorized filters and balance checks
+        self.columnar: bool = columnar
+        # Rendered monthly charts, keyed by the month's data version: every change to a month bumps its
+        # version, and a reload bumps the generation, which stands for every month at once
+        self.chart_cache_size: int = chart_cache_size
+        self.chart_cache_dir: str | None = chart_cache_dir
+        self._chart_cache: ChartCache | None = None
+        self._generation: int = 0
+        self._reset_indexes()
+        # In debug mode materialized aggregates are checked against a full scan on every read
+        self.debug: bool = debug
+        # Shared mode is for files that other processes write at the same time: ids come from a
+        # counter kept with the file, and saving first merges in whatever the others saved
+        self.shared: bool = shared
+        # Thread-safe mode serializes the public methods on one lock, for use from a worker pool
+        self.thread_safe: bool = thread_safe
+        self._lock: AbstractContextManager[Any] = RLock() if thread_safe else nullcontext()
+        # Instrumentation (instrument=True, or the FINANCE_STATS environment variable) wraps every
+        # operation to measure it; when off, the methods are left as they are. The flag alone only
+        # collects for stats(): the report at exit is asked for with FINANCE_STATS
+        self._rows_scanned: int = 0
+        self._instrumentation: instrumentation.Instrumentation | None = None
+        if instrument is None:
+            instrument = instrumentation.enabled_by_environment()
+        if instrument:
+            self._instrumentation = instrumentation.Instrumentation()
+            if instrumentation.enabled_by_environment():
+                self._instrumentation.dump_at_exit()
+        if self._instrumentation is not None or thread_safe:
+            for name in OPERATIONS:
+                method = getattr(self, name)
+                if self._instrumentation is not None:
+                    method = self._instrumentation.wrap(name, method, self._counters)
+                if thread_safe:
+                    method = self._synchronized(method)
+                setattr(self, name, method)
         self.load_from_file()
 
-    def load_from_file(self) -> None:
-        if not exists(self.filename):
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    @property
+    def balance(self) -> float:
+        return self._balance_cents / 100
+
+    @property
+    def transactions(self) -> list[Transaction]:
+        with self._lock:
+            if self._transactions is None:
+                self._transactions = [self._materialize(t) for t in self._by_id.values()]
+            return self._transactions
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        # Per operation: calls, seconds, rows (scanned), bytes_read and bytes_written; empty unless instrumented
+        return self._instrumentation.stats() if self._instrumentation is not None else {}
+
+    def _counters(self) -> tuple[int, int, int]:
+        storage = self.storage
+        return self._rows_scanned, storage.bytes_read, storage.bytes_written
+
+    def _synchronized(self, method: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(method)
+        def locked(*args: Any, **kwargs: Any) -> Any:
+            with self._lock:
+                return method(*args, **kwargs)
+        return locked
+
+    def _reset_indexes(self) -> None:
+        self._store: ColumnarStore | None = None
+        if self.columnar:
+            # numpy is only imported when the columnar store is asked for, to keep startup fast
+            from columnar import ColumnarStore
+            self._store = ColumnarStore()
+        self._date_index = DateIndex()
+        self._summary_cube = SummaryCube()
+        self._balance_index = BalanceIndex()
+        self._indexes: list[TransactionIndex] = [self._date_index, self._summary_cube, self._balance_index]
+        # Indexes (and the columnar store) are built on first use, so loading a ledger stays cheap.
+        # The text index is only built for the first search and then maintained with the rest
+        self._text_index: TextIndex | None = None
+        self._indexed: bool = False
+        self._generation += 1
+        self._month_versions: dict[tuple[int, int], int] = {}
+
+    def _ensure_indexed(self) -> None:
+        if self._indexed:
             return
 
-        with open(self.filename, "r", encoding="utf-8") as json_file:
-            data: list[dict[str, Any]] = json.load(json_file)
+        transactions = list(self._by_id.values())
+        self._rows_scanned += len(transactions)
+        for index in self._indexes:
+            index.extend(transactions)
+        if self._store is not None:
+            self._store.extend(transactions)
+        self._indexed = True
+
+    def _ensure_searchable(self) -> TextIndex:
+        self._ensure_indexed()
+        if self._text_index is None:
+            self._text_index = TextIndex()
+            self._text_index.extend(list(self._by_id.values()))
+            self._rows_scanned += len(self._by_id)
+            self._indexes.append(self._text_index)
+        return self._text_index
+
+    def warm_up(self) -> None:
+        # Builds every index now instead of on the first query, for long-running processes
+        self._ensure_searchable()
+
+    def _index(self, transaction: Transaction) -> None:
+        if self._indexed:
+            for index in self._indexes:
+                index.add(transaction)
+
+    def _unindex(self, transaction: Transaction | TransactionRecord) -> None:
+        if self._indexed:
+            for index in self._indexes:
+                index.discard(transaction)
+
+    def _touch(self, ordinals: Iterable[int]) -> None:
+        # Bumps the data version of the months of the given days
+        for month in {(day.year, day.month) for day in map(date.fromordinal, set(ordinals))}:
+            self._month_versions[month] = self._month_versions.get(month, 0) + 1
+
+    def data_version(self, month: int, year: int) -> tuple[int, int]:
+        # Changes whenever a transaction dated in that month is added, edited or deleted
+        return self._generation, self._month_versions.get((year, month), 0)
+
+    def _materialize(self, item: Transaction | TransactionRecord) -> Transaction:
+        if isinstance(item, TransactionRecord):
+            transaction = self._by_id[item.id] = item.to_transaction()
+            return transaction
+        return item
 
-        for transaction_data in data:
-            transaction = Transaction(
-                transaction_data["t_type"],
-                transaction_data["amount"],
-                transaction_data["category"],
-                transaction_data.get("description"),
-                datetime.strptime(transaction_data["transaction_date"], "%d/%m/%y").date()
-            )
-            self.add_transaction(transaction, show_message=False)
+    @property
+    def storage(self) -> StorageBackend:
+        # Follows reassignments of self.filename
+        if self._storage is None or self._storage.filename != self.filename:
+            self._storage = open_backend(self.filename, journaled=self.journaled,
+                                         compact_threshold=self.compact_threshold, shared=self.shared)
+        return self._storage
+
+    def load_from_file(self) -> None:
+        # Records hold no reference cycles, so the collector would only rescan the growing ledger
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.storage.load(self._by_id)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._loaded()
+
+    def reload(self) -> None:
+        # Drops everything in memory and reads storage again, e.g. when a failed commit left memory
+        # ahead of the file
+        self._by_id.clear()
+        self.next_id = 1
+        self.load_from_file()
+
+    def _loaded(self) -> None:
+        # Derived state is rebuilt from _by_id after it was (re)read from storage
+        self._transactions = None
+        self._reset_indexes()
+        self._balance_cents = _ledger_cents(self._by_id.values())
+        self._rows_scanned += len(self._by_id)
 
         # Ensure next ID is not repeated
-        if self.transactions:
-            self.next_id = max(t.id for t in self.transactions) + 1
+        if self._by_id:
+            self.next_id = max(max(self._by_id) + 1, self.next_id)
+
+    def sync(self) -> bool:
+        # Pulls in what other sessions saved since this one loaded, keeping this session's own changes.
+        # Returns whether anything changed
+        changes = self.storage.refresh(self._by_id)
+        if changes is None:
+            self._loaded()
+            return True
+        if changes:
+            self._changed(changes)
+        return bool(changes)
+
+    def _changed(self, changes: Changes) -> None:
+        # Brings derived state up to date with the ids storage changed in _by_id, given what each held
+        # before, so the indexes stay warm
+        self._transactions = None
+        for transaction_id, previous in changes.items():
+            current = self._by_id.get(transaction_id)
+            if previous is not None:
+                self._touch([previous.ordinal])
+                self._balance_cents -= _ledger_cents([previous])
+                self._unindex(previous)
+            if current is not None:
+                self._touch([current.ordinal])
+                self._balance_cents += _ledger_cents([current])
+                self._index(current)
+                self.next_id = max(transaction_id + 1, self.next_id)
+
+            if self._indexed and self._store is not None:
+                if previous is not None and current is not None:
+                    self._store.update(current)
+                elif current is not None:
+                    self._store.append(current)
+                elif previous is not None:
+                    self._store.remove(previous)
 
     def save_to_file(self) -> None:
-        transaction_data = [t.to_dict() for t in self.transactions]
-        with open(self.filename, 'w', encoding="utf-8") as json_file:
-            json.dump(transaction_data, json_file, ensure_ascii=False, indent=4)
+        # Optimistic merge: under the file lock, re-read what others saved and write the union
+        with self.storage.locked():
+            self.sync()
+            self.storage.save(self._by_id.values())
+
+    def compact(self) -> None:
+        with self.storage.locked():
+            self.sync()
+            self.storage.compact(self._by_id.values())
+
+    def _allocate_ids(self, count: int) -> int:
+        # First of `count` consecutive ids; in shared mode no other session gets them
+        first_id = self.storage.allocate_ids(count, self.next_id)
+        self.next_id = first_id + count
+        return first_id
+
+    def _insert(self, transaction: Transaction) -> None:
+        self._by_id[transaction.id] = transaction
+        if self._transactions is not None:
+            self._transactions.append(transaction)
+        self._touch([transaction.ordinal])
 
-    def add_transaction(self, transaction: Transaction, show_message: bool = True) -> None:
-        self.transactions.append(transaction)
-        transaction.id = self.next_id
-        self.next_id += 1
+        if transaction.t_type == "Gasto":
+            self._balance_cents -= transaction.cents
+        elif transaction.t_type == "Ingreso":
+            self._balance_cents += transaction.cents
+
+        self._index(transaction)
+        if self._indexed and self._store is not None:
+            self._store.append(transaction)
+
+    def _insert_many(self, transactions: list[Transaction | TransactionRecord]) -> None:
+        for transaction in transactions:
+            self._by_id[transaction.id] = transaction
+        self._transactions = None
+        # Bulk loads touch few distinct days, so versioning costs one set over the batch
+        self._touch(t.ordinal for t in transactions)
+
+        # One balance update for the whole batch
+        self._balance_cents += _ledger_cents(transactions)
+
+        if self._indexed:
+            for index in self._indexes:
+                index.extend(transactions)
+            if self._store is not None:
+                self._store.extend(transactions)
+
+    def _remove(self, transaction: Transaction | TransactionRecord) -> None:
+        # Deleting from the id index is O(1); the list view is only rebuilt when next read
+        del self._by_id[transaction.id]
+        self._transactions = None
+        self._touch([transaction.ordinal])
 
         if transaction.t_type == "Gasto":
-            self.balance -= transaction.amount
+            self._balance_cents += transaction.cents
         elif transaction.t_type == "Ingreso":
-            self.balance += transaction.amount
+            self._balance_cents -= transaction.cents
+
+        self._unindex(transaction)
+        if self._indexed and self._store is not None:
+            self._store.remove(transaction)
+
+    def add_transaction(self, transaction: Transaction, show_message: bool = True) -> None:
+        transaction.id = self._allocate_ids(1)
+        self._insert(transaction)
+        self.storage.put([transaction])
 
         if show_message:
             print(f"Transacción agregada exitosamente.")
 
+    def add_transactions(self, transactions: list[Transaction]) -> list[Transaction]:
+        # Ids are handed out as one block and the whole batch is written to storage at once
+        for transaction_id, transaction in enumerate(transactions, self._allocate_ids(len(transactions))):
+            transaction.id = transaction_id
+
+        self._insert_many(transactions)
+        self.storage.put(transactions)
+        return transactions
+
+    def import_csv(self, path: str, mapping: Mapping[str, str], date_format: str = "%d/%m/%y",
+                   delimiter: str = ",", batch_size: int = 10_000) -> ImportReport:
+        # mapping goes from transaction field (t_type, amount, category, description, transaction_date)
+        # to CSV column name
+        report = ImportReport()
+        started = perf_counter()
+
+        for batch in read_csv_batches(path, mapping, report, date_format, delimiter, batch_size):
+            # Ids are handed out as one block per batch
+            first_id = self._allocate_ids(len(batch))
+            records = [TransactionRecord(transaction_id, *row) for transaction_id, row in enumerate(batch, first_id)]
+
+            self._insert_many(records)
+            self.storage.put(records)
+            report.imported += len(records)
+
+        report.seconds = perf_counter() - started
+        return report
+
     def find_transaction_by_id(self, transaction_id: int) -> Transaction | None:
-        for transaction in self.transactions:
-            if transaction_id == transaction.id:
-                return transaction
-        return None
+        transaction = self._by_id.get(transaction_id)
+        return self._materialize(transaction) if transaction else None
+
+    def update_transaction(self, transaction_id: int, **fields: Any) -> Transaction | None:
+        # Non-interactive edit of any of t_type, amount, category, description and transaction_date
+        updated = self.update_transactions([transaction_id], **fields)
+        return updated[0] if updated else None
+
+    def update_transactions(self, transaction_ids: Iterable[int], **fields: Any) -> list[Transaction]:
+        # Applies the same changes to every existing id and writes them to storage in one go
+        unknown = set(fields) - set(EDITABLE_FIELDS)
+        if unknown:
+            raise ValueError(f"Campos desconocidos: {', '.join(sorted(unknown))}")
+        # Everything is checked before the first transaction is touched: a bad value must not leave a
+        # transaction unindexed or the balance half reversed
+        if "t_type" in fields:
+            t_type = fields["t_type"]
+            fields["t_type"] = t_type.capitalize() if isinstance(t_type, str) else t_type
+            if fields["t_type"] not in ("Gasto", "Ingreso"):
+                raise ValueError(f"Tipo inválido: {t_type}")
+        if "amount" in fields and not is_valid_amount(fields["amount"]):
+            raise ValueError("El monto debe ser un número positivo")
+        if "category" in fields and not (isinstance(fields["category"], str) and fields["category"]):
+            raise ValueError("La categoría no puede quedar vacía")
+        if "description" in fields and not isinstance(fields["description"], (str, type(None))):
+            raise ValueError("La descripción debe ser texto")
+        if "transaction_date" in fields and not isinstance(fields["transaction_date"], date):
+            raise ValueError(f"Fecha inválida: {fields['transaction_date']}")
+
+        updated = []
+        for transaction_id in transaction_ids:
+            transaction = self.find_transaction_by_id(transaction_id)
+            if transaction is None:
+                continue
+
+            self._unindex(transaction)
+            previous_ordinal = transaction.ordinal
+            if transaction.t_type == "Gasto":
+                self._balance_cents += transaction.cents
+            elif transaction.t_type == "Ingreso":
+                self._balance_cents -= transaction.cents
+
+            if "t_type" in fields:
+                transaction.t_type = intern(fields["t_type"])
+            if "amount" in fields:
+                transaction.amount = fields["amount"]
+            if "category" in fields:
+                transaction.category = intern(fields["category"].lower())
+            if "description" in fields:
+                transaction.description = intern(fields["description"].lower()) if fields["description"] else None
+            if "transaction_date" in fields:
+                transaction.transaction_date = fields["transaction_date"]
+
+            if transaction.t_type == "Gasto":
+                self._balance_cents -= transaction.cents
+            elif transaction.t_type == "Ingreso":
+                self._balance_cents += transaction.cents
+            self._touch([previous_ordinal, transaction.ordinal])
+            self._index(transaction)
+            if self._indexed and self._store is not None:
+                self._store.update(transaction)
+            updated.append(transaction)
+
+        self.storage.put(updated)
+        return updated
 
     def edit_transaction(self, transaction_id: int) -> Transaction | None:
         transaction = self.find_transaction_by_id(transaction_id)
-        if transaction:
-            print(f"Editando transacción: {transaction}")
-
-            print(f"El monto actual es ${transaction.amount:,.2f}")
-            while True:
-                try:
-                    new_amount_input = input(f"Ingrese el nuevo monto (dejar vacío para no cambiar): $")
-                    if new_amount_input != "":
-                        new_amount = float(new_amount_input)
-                        amount_difference = new_amount - transaction.amount
-                        if transaction.t_type == "Gasto":
-                            self.balance -= amount_difference
-                        elif transaction.t_type == "Ingreso":
-                            self.balance += amount_difference
-
-                        transaction.amount = new_amount
-                    break
-                except ValueError:
-                    print("Debe ingresar un número.")
-
-            print(f"La categoría actual es '{transaction.category.capitalize()}'")
-            new_category = input("Ingrese la nueva categoría (dejar vacío para no cambiar): ")
-            if new_category != "":
-                transaction.category = new_category
-
-            if transaction.description:
-                print(f"La descripción actual es {transaction.description.capitalize()}")
-            else:
-                print("Actualmente la transacción no tiene descripción")
-            new_description = input("Ingrese la nueva descripción (dejar vacío para no cambiar): ")
-            if new_description != "":
-                transaction.description = new_description
-
-            print(f"La fecha actual es {transaction.transaction_date.strftime('%d/%m/%y')}")
-            while True:
-                try:
-                    new_date_input = input("Ingrese la nueva fecha (dd/mm/yy) (dejar vacío para no cambiar): ")
-                    if new_date_input:
-                        new_date = datetime.strptime(new_date_input, "%d/%m/%y").date()
-                        transaction.transaction_date = new_date
-                    break
-                except ValueError:
-                    print("Por favor ingrese el formato solicitado.")
-
-            print(f"Transacción editada exitosamente.")
-            return transaction
-
-        else:
+        if not transaction:
             print("Esta transacción no existe. Ingrese un ID válido.")
             return None
 
-    def delete_transaction(self, transaction_id: int) -> Transaction | None:
-        transaction = self.find_transaction_by_id(transaction_id)
+        print(f"Editando transacción: {transaction}")
+        fields: dict[str, Any] = {}
 
-        if transaction:
-            confirm = input(f"¿Seguro que desea eliminar la transacción {transaction.id}? (s/n): ").lower()
-            if confirm in ("s", "sí", "si"):
-                if transaction.t_type == "Gasto":
-                    self.balance += transaction.amount
-                elif transaction.t_type == "Ingreso":
-                    self.balance -= transaction.amount
-                print(f"Transacción eliminada exitosamente.")
-                self.transactions.remove(transaction)
-                return transaction
-
-            print("Operación cancelada")
+        print(f"El monto actual es ${transaction.amount:,.2f}")
+        while True:
+            try:
+                new_amount_input = input(f"Ingrese el nuevo monto (dejar vacío para no cambiar): $")
+                if new_amount_input != "":
+                    new_amount = float(new_amount_input)
+                    if not is_valid_amount(new_amount):
+                        print("Debe ingresar un número positivo.")
+                        continue
+                    fields["amount"] = new_amount
+                break
+            except ValueError:
+                print("Debe ingresar un número.")
+
+        print(f"La categoría actual es '{transaction.category.capitalize()}'")
+        new_category = input("Ingrese la nueva categoría (dejar vacío para no cambiar): ")
+        if new_category != "":
+            fields["category"] = new_category
+
+        if transaction.description:
+            print(f"La descripción actual es {transaction.description.capitalize()}")
+        else:
+            print("Actualmente la transacción no tiene descripción")
+        new_description = input("Ingrese la nueva descripción (dejar vacío para no cambiar): ")
+        if new_description != "":
+            fields["description"] = new_description
+
+        print(f"La fecha actual es {transaction.transaction_date.strftime('%d/%m/%y')}")
+        while True:
+            try:
+                new_date_input = input("Ingrese la nueva fecha (dd/mm/yy) (dejar vacío para no cambiar): ")
+                if new_date_input:
+                    fields["transaction_date"] = datetime.strptime(new_date_input, "%d/%m/%y").date()
+                break
+            except ValueError:
+                print("Por favor ingrese el formato solicitado.")
+
+        self.update_transaction(transaction.id, **fields)
+        print(f"Transacción editada exitosamente.")
+        return transaction
+
+    def delete_transaction(self, transaction_id: int, confirm: bool = False) -> Transaction | None:
+        # With confirm=True the user is asked first and the outcome is printed, as in the menu
+        transaction = self.find_transaction_by_id(transaction_id)
+        if not transaction:
+            if confirm:
+                print("Esta transacción no existe. Ingrese un ID válido.")
             return None
 
-        print("Esta transacción no existe. Ingrese un ID válido.")
-        return None
+        if confirm:
+            answer = input(f"¿Seguro que desea eliminar la transacción {transaction.id}? (s/n): ").lower()
+            if answer not in ("s", "sí", "si"):
+                print("Operación cancelada")
+                return None
+
+        self._remove(transaction)
+        self.storage.delete([transaction.id])
+        if confirm:
+            print(f"Transacción eliminada exitosamente.")
+        return transaction
+
+    def delete_transactions(self, transaction_ids: Iterable[int]) -> list[Transaction]:
+        deleted = []
+        for transaction_id in transaction_ids:
+            transaction = self._by_id.get(transaction_id)
+            if transaction:
+                transaction = self._materialize(transaction)
+                self._remove(transaction)
+                deleted.append(transaction)
+
+        self.storage.delete([t.id for t in deleted])
+        return deleted
+
+    def verify_balance(self) -> bool:
+        # Recomputes the balance from the whole ledger in one pass (in SQL or over the columnar arrays
+        # when available) and reconciles the running total; returns whether they already agreed
+        if self.storage.supports_queries:
+            cents = self.storage.balance_cents()
+        elif self._store is not None:
+            self._ensure_indexed()
+            cents = self._store.balance_cents()
+        else:
+            cents = _ledger_cents(self._by_id.values())
+        self._rows_scanned += len(self._by_id)
+
+        matches = cents == self._balance_cents
+        self._balance_cents = cents
+        return matches
+
+    def balance_at(self, day: date) -> float:
+        # Balance at the end of the given day, from the running totals of the balance index (O(log N))
+        self._ensure_indexed()
+        cents = self._balance_index.balance_at(day)
+
+        if self.debug:
+            ordinal = day.toordinal()
+            expected = _ledger_cents(t for t in self._by_id.values() if t.ordinal <= ordinal)
+            self._rows_scanned += len(self._by_id)
+            if cents != expected:
+                raise AssertionError(f"Balance al {day:%d/%m/%y} inconsistente: {cents} != {expected} centavos")
+
+        return cents / 100
+
+    def balance_series(self, start: date, end: date, group_by: str = "month") -> list[tuple[date, float]]:
+        # Closing balance of every day/week/month/quarter/year between start and end, keyed by the
+        # first day of the period; the last period closes at `end`
+        if group_by not in aggregation.GROUP_BY:
+            raise ValueError(f"Agrupación desconocida: {group_by} (use {', '.join(aggregation.GROUP_BY)})")
+
+        self._ensure_indexed()
+        return [(period, self._balance_index.balance_at(
+                    min(aggregation.next_period(period, group_by) - timedelta(days=1), end)) / 100)
+                for period in aggregation.periods(start, end, group_by)]
 
     def display_balance(self) -> None:
         print(f"Actualmente tiene ${self.balance:.2f}")
 
     def filter_transactions(self, category: str | None = None, t_type: str | None = None, date_from: date | None = None,
-                            date_to: date | None = None) -> list[Transaction]:
-        filtered = self.transactions
-
+                            date_to: date | None = None, text: str | None = None) -> list[Transaction]:
+        # text is a full-text query over description and category (see TextIndex), e.g. "uber OR taxi"
+        if self.shared and self.storage.supports_queries:
+            # The SQL query sees rows other sessions committed, so they must be loaded here too
+            self.sync()
+        # An empty query is an error (TextIndex.search raises), not the same as no text filter
+        matches = self._ensure_searchable().search(text) if text is not None else None
+
+        if self.storage.supports_queries:
+            ids = self.storage.filter_ids(category, t_type, date_from, date_to)
+            self._rows_scanned += len(ids)
+            if matches is not None:
+                ids = [transaction_id for transaction_id in ids if transaction_id in matches]
+            return [self._materialize(self._by_id[transaction_id]) for transaction_id in ids]
+
+        self._ensure_indexed()
+        if self._store is not None:
+            # Vectorized over every row. A record the store still holds may already have been
+            # materialized elsewhere, so it is looked up to return that same Transaction
+            found = self._store.filter(lambda record: self._materialize(self._by_id[record.id]),
+                                       category, t_type, date_from, date_to)
+            self._rows_scanned += len(self._by_id)
+            if matches is not None:
+                found = [t for t in found if t.id in matches]
+            return found
+
+        if not (category or t_type or date_from or date_to or text):
+            self._rows_scanned += len(self._by_id)
+            return self.transactions
+
+        filtered = self._by_id.values()
+
+        if matches is not None:
+            # Search results are usually few, so the date filter runs over them directly
+            filtered = [self._by_id[transaction_id] for transaction_id in sorted(matches)]
+            self._rows_scanned += len(filtered)
+            if date_from:
+                filtered = [t for t in filtered if t.ordinal >= date_from.toordinal()]
+            if date_to:
+                filtered = [t for t in filtered if t.ordinal <= date_to.toordinal()]
+        elif date_from or date_to:
+            # Narrow by date first with the sorted index, keeping the ledger (id) order
+            ids = sorted(self._date_index.between(date_from, date_to))
+            filtered = [self._by_id[transaction_id] for transaction_id in ids]
+            self._rows_scanned += len(filtered)
+
+        if (category or t_type) and matches is None and not (date_from or date_to):
+            self._rows_scanned += len(filtered)
         if category:
             filtered = [t for t in filtered if t.category == category.lower()]
 
         if t_type:
             filtered = [t for t in filtered if t.t_type.lower() == t_type.lower()]
 
-        if date_from:
-            filtered = [t for t in filtered if t.transaction_date >= date_from]
+        return [self._materialize(t) for t in filtered]
 
-        if date_to:
-            filtered = [t for t in filtered if t.transaction_date <= date_to]
-
-        return filtered
+    def search(self, query: str) -> list[Transaction]:
+        return self.filter_transactions(text=query)
 
     def display_transactions(self) -> None:
-        if self.transactions:
+        if self._by_id:
             # Show available options to the user
-            categories = sorted(set(t.category.capitalize() for t in self.transactions))
-            types = sorted(set(t.t_type for t in self.transactions))
+            categories = sorted(set(t.category.capitalize() for t in self._by_id.values()))
+            types = sorted(set(t.t_type for t in self._by_id.values()))
 
             print("\nCategorías disponibles:", ", ".join(categories))
             category = input("Filtrar por categoría (dejar vacío para ignorar): ").strip()
@@ -193,13 +660,76 @@ class FinanceManager:
             print("Actualmente no hay transacciones.")
 
     def get_monthly_summary_by_category(self, month: int, year: int) -> list[tuple[str, float]]:
-        summary = {}
-        for t in self.transactions:
-            if t.t_type == "Gasto" and t.transaction_date.month == month and t.transaction_date.year == year:
-                summary[t.category] = summary.get(t.category, 0) + t.amount
+        if self.storage.supports_queries:
+            summary = self.storage.category_totals(year, month, "Gasto")
+        else:
+            self._ensure_indexed()
+            summary = self._summary_cube.totals(year, month, "Gasto")
+
+        if self.debug:
+            # Both sides are sums of integer cents, so they must match exactly
+            expected = self._scan_monthly_summary(month, year)
+            if summary != expected:
+                raise AssertionError(f"Resumen de {month:02d}/{year} inconsistente: {summary} != {expected}")
+
         sorted_summary = sorted(summary.items(), key=lambda x: x[1], reverse=True)
         return sorted_summary
 
+    def summary_range(self, start: date, end: date, group_by: str = "month", t_type: str = "Gasto",
+                      workers: int | None = None) -> dict[date, list[tuple[str, float]]]:
+        # Totals by category for every day/week/month/quarter/year between start and end (inclusive),
+        # keyed by the first day of each period, from a single pass over the range. Large ranges are
+        # split by date across worker processes (workers=None picks automatically, 1 never forks)
+        if group_by not in aggregation.GROUP_BY:
+            raise ValueError(f"Agrupación desconocida: {group_by} (use {', '.join(aggregation.GROUP_BY)})")
+
+        if self.storage.supports_queries:
+            if workers is None:
+                workers = aggregation.default_workers(self.storage.count_rows(start.toordinal(), end.toordinal()))
+            # Worker connections would not see rows still uncommitted inside a batch()
+            if workers > 1 and not self.storage.uncommitted:
+                totals = aggregation.parallel_sqlite_totals(self.storage.filename, t_type, start, end, workers)
+            else:
+                totals = self.storage.daily_totals(t_type, start.toordinal(), end.toordinal())
+            return aggregation.fold(totals, start, end, group_by)
+
+        self._ensure_indexed()
+        first_month = start if start.day == 1 else aggregation.next_period(start.replace(day=1), "month")
+        after_last_month = aggregation.period_start(end + timedelta(days=1), "month")
+        if group_by in ("day", "week") or first_month >= after_last_month:
+            return aggregation.fold(self._scan_daily_totals(start, end, t_type, workers), start, end, group_by)
+
+        # Whole months come straight from the summary cube; only partial months at the edges are scanned
+        partials = []
+        if start < first_month:
+            partials.append(self._scan_daily_totals(start, first_month - timedelta(days=1), t_type, workers))
+        for month in aggregation.periods(first_month, after_last_month - timedelta(days=1), "month"):
+            ordinal = month.toordinal()
+            partials.append({(ordinal, category): cents for category, cents
+                             in self._summary_cube.cent_totals(month.year, month.month, t_type).items()})
+        if after_last_month <= end:
+            partials.append(self._scan_daily_totals(after_last_month, end, t_type, workers))
+
+        return aggregation.fold(aggregation.merge(partials), start, end, group_by)
+
+    def _scan_daily_totals(self, date_from: date, date_to: date, t_type: str,
+                           workers: int | None) -> dict[tuple[int, str], int]:
+        ids = self._date_index.between(date_from, date_to)
+        self._rows_scanned += len(ids)
+        if workers is None:
+            workers = aggregation.default_workers(len(ids))
+        if workers > 1 and aggregation.can_fork():
+            return aggregation.parallel_daily_totals(self._by_id, ids, t_type, workers)
+        return aggregation.daily_totals(map(self._by_id.__getitem__, ids), t_type)
+
+    def _scan_monthly_summary(self, month: int, year: int) -> dict[str, float]:
+        summary = {}
+        self._rows_scanned += len(self._by_id)
+        for t in self._by_id.values():
+            if t.t_type == "Gasto" and t.transaction_date.month == month and t.transaction_date.year == year:
+                summary[t.category] = summary.get(t.category, 0) + t.cents
+        return {category: cents / 100 for category, cents in summary.items()}
+
     def print_monthly_summary(self, month: int, year: int) -> None:
         summary = self.get_monthly_summary_by_category(month, year)
         if summary:
@@ -211,34 +741,38 @@ class FinanceManager:
         else:
             print(f"No tienes gastos registrados para {month:02d}/{year}")
 
-    def plot_monthly_summary_by_category(self, month: int, year: int) -> None:
-        summary = self.get_monthly_summary_by_category(month, year)
-        if not summary:
-            print(f"No hay datos para {month:02d}/{year}.")
-            return
+    @property
+    def chart_cache(self) -> "ChartCache":
+        if self._chart_cache is None:
+            from plotting import ChartCache
+            self._chart_cache = ChartCache(self.chart_cache_size, self.chart_cache_dir)
+        return self._chart_cache
+
+    def plot_monthly_summary_by_category(self, month: int, year: int, path: str | None = None,
+                                         image_format: str | None = None) -> bytes | None:
+        # Shows the chart in a window, or renders it headless when a file or an image format is given:
+        # the PNG/SVG bytes are returned and, with a path, also written there (format from the extension).
+        # Charts are cached until their month changes, so repeat views skip the summary and matplotlib
+        import plotting
+
+        show = path is None and image_format is None
+        if image_format is None:
+            image_format = "png" if path is None else splitext(path)[1].lstrip(".").lower()
+
+        key = (year, month, image_format, self.data_version(month, year))
+        image = self.chart_cache.get(key)
+        if image is None:
+            summary = self.get_monthly_summary_by_category(month, year)
+            if not summary:
+                print(f"No hay datos para {month:02d}/{year}.")
+                return None
+            image = self.chart_cache.render(key, summary, month, year, image_format)
+
+        if show:
+            plotting.show_image(image)
+            return None
 
-        categories = [item[0] for item in summary]
-        amounts = [item[1] for item in summary]
-        explode = [0.1 if i == 0 else 0 for i in range(len(categories))]
-
-        fig, ax = plt.subplots(figsize=(6, 6))
-
-        wedges, texts = ax.pie(
-            amounts,
-            labels=[c.capitalize() for c in categories],
-            wedgeprops=dict(width=0.4),  # Donut width
-            startangle=90,
-            explode=explode
-        )
-
-        # Show amounts
-        for i, wedge in enumerate(wedges):
-            angle = (wedge.theta2 + wedge.theta1) / 2
-            x = 0.8 * np.cos(angle * np.pi / 180)
-            y = 0.8 * np.sin(angle * np.pi / 180)
-            ax.text(x, y, f"${amounts[i]:,.0f}", ha='center', va='center', fontsize=10,
-                    bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="none", alpha=0.7))
-
-        ax.set_title(f"Gastos por categoría - {month:02d}/{year}")
-        plt.tight_layout()
-        plt.show()
\ No newline at end of file
+        if path is not None:
+            with open(path, "wb") as image_file:
+                image_file.write(image)
+        return image
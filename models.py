@@ -1,16 +1,62 @@
-from datetime import date
-from typing import Any
+import math
+
+from datetime import date, datetime
+from functools import cache, partial
+from operator import itemgetter
+from sys import intern
+from typing import Any, NamedTuple
+
+
+@cache
+def parse_date(text: str) -> date:
+    # Ledgers repeat the same few thousand dates, so each string is only parsed once
+    return datetime.strptime(text, "%d/%m/%y").date()
+
+
+# Shares one int object per distinct day instead of allocating one per transaction
+_to_ordinal = cache(date.toordinal)
+
+
+def to_cents(amount: float) -> int:
+    # Money is kept as integer cents so sums and balances are exact; amounts are entered and
+    # stored with at most two decimals, so rounding recovers the cents a float stands for
+    return round(amount * 100)
+
+
+def is_valid_amount(amount: Any) -> bool:
+    # What every entry point accepts: a finite number that is still worth at least a cent once stored
+    return (isinstance(amount, (int, float)) and not isinstance(amount, bool) and math.isfinite(amount)
+            and to_cents(amount) > 0)
 
 
 class Transaction:
+    # No per-instance __dict__, interned strings, the amount in integer cents and the date kept as a
+    # shared day ordinal
+    __slots__ = ("id", "t_type", "cents", "category", "description", "ordinal")
 
     def __init__(self, t_type: str, amount: float, category: str, description: str | None = None, transaction_date: date | None = None) -> None:
         self.id: int = -1
-        self.t_type: str = t_type
-        self.amount: float = amount
-        self.category: str = category.lower()
-        self.description: str | None = description.lower() if description else None
-        self.transaction_date = transaction_date or date.today()
+        self.t_type: str = intern(t_type)
+        self.cents: int = to_cents(amount)
+        self.category: str = intern(category.lower())
+        self.description: str | None = intern(description.lower()) if description else None
+        self.ordinal: int = _to_ordinal(transaction_date or date.today())
+
+    @property
+    def amount(self) -> float:
+        return self.cents / 100
+
+    @amount.setter
+    def amount(self, value: float) -> None:
+        self.cents = to_cents(value)
+
+    @property
+    def transaction_date(self) -> date:
+        return date.fromordinal(self.ordinal)
+
+    @transaction_date.setter
+    def transaction_date(self, value: date) -> None:
+        self.ordinal = _to_ordinal(value)
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -27,4 +73,67 @@ class Transaction:
         return (
             f"[{self.id}] {self.t_type:<8} | ${self.amount:<14,.2f} | {self.category.capitalize():<13} | "
             f"{formatted_description:<10} | {self.transaction_date.strftime('%d/%m/%y')}"
-        )
\ No newline at end of file
+        )
+
+
+class TransactionRecord(NamedTuple):
+    # Lightweight row as read from storage; becomes a Transaction only when accessed
+    id: int
+    t_type: str
+    cents: int
+    category: str
+    description: str | None
+    transaction_date: date
+
+    @property
+    def amount(self) -> float:
+        return self.cents / 100
+
+    @property
+    def ordinal(self) -> int:
+        return self.transaction_date.toordinal()
+
+    @classmethod
+    def from_dicts(cls, data: list[dict[str, Any]]) -> list["TransactionRecord"]:
+        # Batch conversion that skips the per-row NamedTuple constructor (and inlines to_cents); much cheaper
+        # than from_dict per row
+        new = partial(tuple.__new__, cls)
+        try:
+            return [new((transaction_id, intern(t_type), round(amount * 100), intern(category.lower()),
+                         intern(description.lower()) if description else None, parse_date(transaction_date)))
+                    for transaction_id, t_type, amount, category, description, transaction_date
+                    in map(_RECORD_FIELDS, data)]
+        except KeyError:
+            return [cls.from_dict(transaction_data) for transaction_data in data]
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TransactionRecord":
+        description = data.get("description")
+        return cls(
+            data["id"],
+            intern(data["t_type"]),
+            to_cents(data["amount"]),
+            intern(data["category"].lower()),
+            intern(description.lower()) if description else None,
+            parse_date(data["transaction_date"])
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "t_type": self.t_type,
+            "amount": self.amount,
+            "category": self.category,
+            "description": self.description,
+            "transaction_date": self.transaction_date.strftime("%d/%m/%y")
+        }
+
+    def to_transaction(self) -> Transaction:
+        transaction = Transaction(self.t_type, 0, self.category, self.description, self.transaction_date)
+        transaction.id = self.id
+        transaction.cents = self.cents
+        return transaction
+
+
+# Keys of a transactions.json entry, in TransactionRecord order
+_RECORD_FIELDS = itemgetter("id", "t_type", "amount", "category", "description", "transaction_date")
@@ -0,0 +1,142 @@
+import hashlib
+import io
+import json
+import math
+import os
+
+from collections import OrderedDict
+from collections.abc import Hashable, Sequence
+
+# matplotlib is imported inside the functions: it costs hundreds of milliseconds and is only
+# needed when a chart is actually drawn. Headless rendering uses a bare Figure, so no GUI
+# backend is ever initialized for PNG/SVG output.
+FORMATS = ("png", "svg")
+
+
+def _draw_donut(ax, summary: Sequence[tuple[str, float]], month: int, year: int) -> None:
+    categories = [item[0] for item in summary]
+    amounts = [item[1] for item in summary]
+    explode = [0.1 if i == 0 else 0 for i in range(len(categories))]
+
+    wedges, texts = ax.pie(
+        amounts,
+        labels=[c.capitalize() for c in categories],
+        wedgeprops=dict(width=0.4),  # Donut width
+        startangle=90,
+        explode=explode
+    )
+
+    # Show amounts
+    for i, wedge in enumerate(wedges):
+        angle = math.radians((wedge.theta2 + wedge.theta1) / 2)
+        x = 0.8 * math.cos(angle)
+        y = 0.8 * math.sin(angle)
+        ax.text(x, y, f"${amounts[i]:,.0f}", ha='center', va='center', fontsize=10,
+                bbox=dict(boxstyle="round,pad=0.3", fc="white", ec="none", alpha=0.7))
+
+    ax.set_title(f"Gastos por categoría - {month:02d}/{year}")
+
+
+def render_monthly_summary(summary: Sequence[tuple[str, float]], month: int, year: int,
+                           image_format: str = "png") -> bytes:
+    if image_format not in FORMATS:
+        raise ValueError(f"Formato de imagen no soportado: {image_format} (use {' o '.join(FORMATS)})")
+
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(6, 6))
+    _draw_donut(fig.subplots(), summary, month, year)
+    fig.tight_layout()
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=image_format)
+    return buffer.getvalue()
+
+
+def show_image(image: bytes) -> None:
+    # Shows an already rendered PNG chart; much cheaper than drawing the donut and laying it out again
+    import matplotlib.image
+    import matplotlib.pyplot as plt
+
+    fig = plt.figure(figsize=(6, 6))
+    ax = fig.add_axes((0, 0, 1, 1))
+    ax.imshow(matplotlib.image.imread(io.BytesIO(image), format="png"))
+    ax.set_axis_off()
+    plt.show()
+
+
+class ChartCache:
+    # LRU of rendered charts. The key carries the month's data version, so a chart is never served
+    # after its month changed; stale entries simply age out. With a directory, charts are also kept
+    # on disk under a digest of the summary they show, which stays valid across sessions.
+    def __init__(self, max_entries: int = 32, directory: str | None = None) -> None:
+        if max_entries < 0:
+            raise ValueError("El tamaño del caché no puede ser negativo")
+        self.max_entries: int = max_entries
+        self.directory: str | None = directory
+        self._images: OrderedDict[Hashable, bytes] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def get(self, key: Hashable) -> bytes | None:
+        image = self._images.get(key)
+        if image is None:
+            self.misses += 1
+            return None
+        self._images.move_to_end(key)
+        self.hits += 1
+        return image
+
+    def put(self, key: Hashable, image: bytes) -> None:
+        self._images[key] = image
+        self._images.move_to_end(key)
+        while len(self._images) > self.max_entries:
+            self._images.popitem(last=False)
+
+    def clear(self) -> None:
+        self._images.clear()
+
+    def render(self, key: Hashable, summary: Sequence[tuple[str, float]], month: int, year: int,
+               image_format: str = "png") -> bytes:
+        # Rendered (or read back from disk) once per key
+        if image_format not in FORMATS:
+            raise ValueError(f"Formato de imagen no soportado: {image_format} (use {' o '.join(FORMATS)})")
+
+        path = None
+        image = None
+        if self.directory is not None:
+            digest = hashlib.sha1(json.dumps(list(summary)).encode()).hexdigest()[:16]
+            prefix = f"{year}-{month:02d}-"
+            path = os.path.join(self.directory, f"{prefix}{digest}.{image_format}")
+            try:
+                with open(path, "rb") as image_file:
+                    image = image_file.read()
+            except FileNotFoundError:
+                pass
+
+        if image is None:
+            image = render_monthly_summary(summary, month, year, image_format)
+            if path is not None:
+                self._write(path, prefix, image_format, image)
+
+        self.put(key, image)
+        return image
+
+    def _write(self, path: str, prefix: str, image_format: str, image: bytes) -> None:
+        # One file per month and format: older versions of the month's chart are removed
+        os.makedirs(self.directory, exist_ok=True)
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(f".{image_format}"):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    # Another session got there first
+                    pass
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as image_file:
+            image_file.write(image)
+        os.replace(temp_path, path)
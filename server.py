@@ -0,0 +1,318 @@
+# Local HTTP/JSON service: one process keeps the ledger and its indexes warm in memory and serves
+# every client, instead of each tool re-reading the file.
+#
+#   python server.py -f transactions.json --port 8765
+#
+#   GET    /transactions?category=comida&type=Gasto&from=01/06/24&to=30/06/24&q=uber+OR+taxi
+#   GET    /transactions/ID
+#   GET    /summary?month=6&year=2024
+#   GET    /balance
+#   POST   /transactions        {"t_type": "Gasto", "amount": 25.5, "category": "comida", ...} or a list of them
+#   PATCH  /transactions/ID     {"category": "ocio"}
+#   DELETE /transactions/ID
+#
+# Reads run on the event loop against the in-memory ledger. Writes are queued to a single writer
+# task, which applies everything waiting in the queue and commits it to disk together (group
+# commit) before answering; a reader never sees a batch half applied.
+import argparse
+import asyncio
+import json
+import sys
+
+from collections.abc import Callable
+from datetime import date, datetime
+from http import HTTPStatus
+from typing import Any
+from urllib.parse import parse_qsl, urlsplit
+
+from manager import FinanceManager
+from models import Transaction, is_valid_amount
+
+# Most writes a single group commit takes from the queue
+MAX_BATCH = 1000
+
+MAX_BODY = 1 << 20
+
+
+class HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status: HTTPStatus = status
+
+
+def parse_date(text: str) -> date:
+    try:
+        return datetime.strptime(text, "%d/%m/%y").date()
+    except ValueError:
+        raise ValueError(f"Fecha inválida: {text} (use dd/mm/yy)")
+
+
+def parse_transaction(data: Any) -> Transaction:
+    # Same rules as the menu and the CLI: known type, positive amount, category required
+    if not isinstance(data, dict):
+        raise ValueError("Se esperaba un objeto con t_type, amount, category, description y transaction_date")
+    t_type = str(data.get("t_type", "")).capitalize()
+    if t_type not in ("Gasto", "Ingreso"):
+        raise ValueError(f"Tipo inválido: {t_type}")
+    amount = data.get("amount")
+    if not is_valid_amount(amount):
+        raise ValueError("El monto debe ser un número positivo")
+    if not data.get("category"):
+        raise ValueError("Falta la categoría")
+    transaction_date = parse_date(data["transaction_date"]) if data.get("transaction_date") else None
+    return Transaction(t_type, amount, data["category"], data.get("description") or None, transaction_date)
+
+
+def parse_fields(data: Any) -> dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ValueError("Se esperaba un objeto con los campos a modificar")
+    fields = dict(data)
+    for name in ("t_type", "category", "description"):
+        if name in fields and not isinstance(fields[name], (str, type(None))):
+            raise ValueError(f"El campo {name} debe ser texto")
+    if "amount" in fields and not is_valid_amount(fields["amount"]):
+        raise ValueError("El monto debe ser un número positivo")
+    if "transaction_date" in fields:
+        if not isinstance(fields["transaction_date"], str):
+            raise ValueError("La fecha debe ser texto dd/mm/yy")
+        fields["transaction_date"] = parse_date(fields["transaction_date"])
+    return fields
+
+
+class FinanceService:
+    def __init__(self, manager: FinanceManager, max_batch: int = MAX_BATCH) -> None:
+        self.manager: FinanceManager = manager
+        self.max_batch: int = max_batch
+        self._writes: asyncio.Queue[tuple[Callable[[], Any], asyncio.Future[Any]]] | None = None
+        self._writer: asyncio.Task[None] | None = None
+        self._server: asyncio.Server | None = None
+        # Group commits made and writes they carried, for the load test and the tests
+        self.commits: int = 0
+        self.writes: int = 0
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> asyncio.Server:
+        self.manager.warm_up()
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop())
+        self._server = await asyncio.start_server(self._serve_connection, host, port)
+        return self._server
+
+    @property
+    def port(self) -> int:
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._writer is not None:
+            # Writes already queued are committed before the writer goes away
+            await self._writes.join()
+            self._writer.cancel()
+        self.manager.save_to_file()
+
+    async def write(self, operation: Callable[[], Any]) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        await self._writes.put((operation, future))
+        return await future
+
+    async def _write_loop(self) -> None:
+        while True:
+            batch = [await self._writes.get()]
+            # Let handlers that are ready queue their writes too, then take everything waiting
+            await asyncio.sleep(0)
+            while len(batch) < self.max_batch and not self._writes.empty():
+                batch.append(self._writes.get_nowait())
+
+            results: list[tuple[asyncio.Future[Any], Any, BaseException | None]] = []
+            try:
+                with self.manager.storage.batch():
+                    for operation, future in batch:
+                        try:
+                            results.append((future, operation(), None))
+                        except Exception as error:
+                            # One rejected write does not fail the rest of the batch
+                            results.append((future, None, error))
+                self.manager.save_to_file()
+                self.commits += 1
+                self.writes += len(batch)
+            except Exception as error:
+                # Nothing in the batch is known to be on disk, so every write in it fails and memory,
+                # which the operations already changed, is read back from storage. The loop goes on
+                failure = HttpError(HTTPStatus.INTERNAL_SERVER_ERROR, f"No se pudo guardar: {error}")
+                results = [(future, None, failure) for _, future in batch]
+                try:
+                    self.manager.reload()
+                except Exception as reload_error:
+                    print(f"No se pudo recargar {self.manager.filename}: {reload_error}", file=sys.stderr)
+
+            for future, result, error in results:
+                if future.cancelled():
+                    continue
+                if error is None:
+                    future.set_result(result)
+                else:
+                    future.set_exception(error)
+            for _ in batch:
+                self._writes.task_done()
+
+    async def _serve_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        # HTTP/1.1 with keep-alive; bodies must come with a Content-Length
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split()
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Cuerpo demasiado grande"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.handle(method, target, body)
+                    keep_alive = (headers.get("connection", "").lower() != "close"
+                                  and version != "HTTP/1.0")
+
+                content = json.dumps(payload, ensure_ascii=False).encode()
+                writer.write(f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                             f"Content-Type: application/json; charset=utf-8\r\n"
+                             f"Content-Length: {len(content)}\r\n"
+                             f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def handle(self, method: str, target: str, body: bytes) -> tuple[HTTPStatus, Any]:
+        try:
+            url = urlsplit(target)
+            query = dict(parse_qsl(url.query))
+            data = json.loads(body) if body else None
+            return await self.route(method, url.path.rstrip("/").split("/")[1:], query, data)
+        except HttpError as error:
+            return error.status, {"error": str(error)}
+        except (ValueError, KeyError) as error:
+            # json.JSONDecodeError is a ValueError too
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Exception as error:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(error).__name__}: {error}"}
+
+    async def route(self, method: str, path: list[str], query: dict[str, str], data: Any) -> tuple[HTTPStatus, Any]:
+        manager = self.manager
+        match method, path:
+            case "GET", ["balance"]:
+                return HTTPStatus.OK, {"balance": manager.balance}
+
+            case "GET", ["summary"]:
+                month, year = int(query["month"]), int(query["year"])
+                if not 1 <= month <= 12:
+                    raise ValueError(f"Mes inválido: {month}")
+                return HTTPStatus.OK, dict(manager.get_monthly_summary_by_category(month, year))
+
+            case "GET", ["transactions"]:
+                results = manager.filter_transactions(
+                    query.get("category") or None,
+                    query.get("type") or None,
+                    parse_date(query["from"]) if query.get("from") else None,
+                    parse_date(query["to"]) if query.get("to") else None,
+                    query.get("q") or None,
+                )
+                return HTTPStatus.OK, [t.to_dict() for t in results]
+
+            case "GET", ["transactions", transaction_id]:
+                transaction = manager.find_transaction_by_id(int(transaction_id))
+                if transaction is None:
+                    raise HttpError(HTTPStatus.NOT_FOUND, f"No existe la transacción {transaction_id}")
+                return HTTPStatus.OK, transaction.to_dict()
+
+            case "POST", ["transactions"]:
+                # Validated before queueing, so a bad record never reaches the writer
+                transactions = [parse_transaction(item) for item in (data if isinstance(data, list) else [data])]
+                added = await self.write(lambda: manager.add_transactions(transactions))
+                result = [t.to_dict() for t in added]
+                return HTTPStatus.CREATED, result if isinstance(data, list) else result[0]
+
+            case "PATCH", ["transactions", transaction_id]:
+                fields = parse_fields(data)
+                updated = await self.write(lambda: manager.update_transaction(int(transaction_id), **fields))
+                if updated is None:
+                    raise HttpError(HTTPStatus.NOT_FOUND, f"No existe la transacción {transaction_id}")
+                return HTTPStatus.OK, updated.to_dict()
+
+            case "DELETE", ["transactions", transaction_id]:
+                deleted = await self.write(lambda: manager.delete_transaction(int(transaction_id)))
+                if deleted is None:
+                    raise HttpError(HTTPStatus.NOT_FOUND, f"No existe la transacción {transaction_id}")
+                return HTTPStatus.OK, deleted.to_dict()
+
+        raise HttpError(HTTPStatus.NOT_FOUND, f"Ruta desconocida: {method} /{'/'.join(path)}")
+
+
+class Client:
+    # Minimal keep-alive client for the service, used by the load test and the tests
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765) -> None:
+        self.host: str = host
+        self.port: int = port
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def request(self, method: str, path: str, data: Any = None) -> tuple[int, Any]:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+        body = json.dumps(data).encode() if data is not None else b""
+        self._writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+                           f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+        await self._writer.drain()
+
+        status = int((await self._reader.readline()).split()[1])
+        length = 0
+        while (line := await self._reader.readline()) not in (b"\r\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            if name.lower() == "content-length":
+                length = int(value)
+        return status, json.loads(await self._reader.readexactly(length))
+
+    async def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._reader, self._writer = None, None
+
+
+async def serve(manager: FinanceManager, host: str, port: int) -> None:
+    service = FinanceService(manager)
+    await service.start(host, port)
+    print(f"Sirviendo {manager.filename} ({len(manager)} transacciones) en http://{host}:{service.port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+def main(arguments: list[str]) -> None:
+    parser = argparse.ArgumentParser(prog="server.py", description="Servicio HTTP/JSON del administrador de finanzas")
+    parser.add_argument("-f", "--file", default="transactions.json",
+                        help="archivo de transacciones (.json, o .db/.sqlite para SQLite)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parsed = parser.parse_args(arguments)
+
+    manager = FinanceManager(parsed.file, journaled=True, shared=True)
+    try:
+        asyncio.run(serve(manager, parsed.host, parsed.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,594 @@
+import json
+import os
+import sqlite3
+import sys
+
+from collections.abc import Iterable, Iterator, MutableMapping, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from datetime import date
+from functools import cache, partial
+from operator import attrgetter
+from os.path import exists, splitext
+from typing import IO, Any
+
+from models import Transaction, TransactionRecord
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+_get_id = attrgetter("id")
+_from_ordinal = cache(date.fromordinal)
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+# Id -> record before a refresh changed it, None for ids that were not there
+Changes = dict[int, Transaction | TransactionRecord | None]
+
+
+def _iter_json_array(json_file: IO[str], chunk_size: int = 1 << 20) -> Iterator[list[dict[str, Any]]]:
+    # Decode a top-level JSON array in batches, so the whole document never sits in memory.
+    # A raw newline cannot occur inside a JSON string, so "},\n" can only close an element;
+    # if a cut still lands inside a nested value, keep reading and retry with more data.
+    buffer = json_file.read(chunk_size).lstrip()
+    if not buffer:
+        return
+    if not buffer.startswith("["):
+        raise ValueError(f"{json_file.name} no contiene una lista de transacciones")
+    buffer = buffer[1:]
+
+    while chunk := json_file.read(chunk_size):
+        buffer += chunk
+        cut = buffer.rfind("},\n")
+        if cut < 0:
+            continue
+        try:
+            batch = json.loads(f"[{buffer[:cut + 1]}]")
+        except json.JSONDecodeError:
+            continue
+        yield batch
+        buffer = buffer[cut + 2:]
+
+    yield json.loads(f"[{buffer}")
+
+
+def _lock(lock_file: IO[str]) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+
+def _unlock(lock_file: IO[str]) -> None:
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+    else:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StorageBackend:
+    # Persistence used by FinanceManager. `put`/`delete` are called for every change so a backend
+    # can write incrementally; `save` is called when the session wants everything on disk.
+    # A shared backend expects other processes to write the same file: ids are handed out from a
+    # counter kept with the file, and `refresh` pulls in what others wrote since it last looked.
+    supports_queries: bool = False
+
+    def __init__(self, filename: str, shared: bool = False) -> None:
+        self.filename: str = filename
+        self.shared: bool = shared
+        # Running totals of file traffic, read by the instrumentation (JSON files; SQLite leaves them at 0)
+        self.bytes_read: int = 0
+        self.bytes_written: int = 0
+
+    def load(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> None:
+        raise NotImplementedError
+
+    def locked(self) -> AbstractContextManager[Any]:
+        # Exclusive access to the file across processes, for a read-merge-write sequence
+        return nullcontext()
+
+    def allocate_ids(self, count: int, floor: int) -> int:
+        # First id of a block of `count` ids that no other session will hand out; at least `floor`
+        return floor
+
+    def refresh(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> Changes | None:
+        # Applies other sessions' changes to records, keeping this session's unsaved ones. Returns the
+        # changed ids with the record each had before (None if it is new), or None when records was
+        # reloaded from scratch
+        return {}
+
+    def batch(self) -> AbstractContextManager[Any]:
+        # Group commit: the puts and deletes made inside reach the disk together, with one sync, on exit
+        return nullcontext()
+
+    def put(self, transactions: Sequence[Transaction]) -> None:
+        pass
+
+    def delete(self, transaction_ids: Sequence[int]) -> None:
+        pass
+
+    def save(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        pass
+
+    def compact(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        self.rewrite(transactions)
+
+    def rewrite(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        raise NotImplementedError
+
+    # Only called when supports_queries is set
+    def filter_ids(self, category: str | None = None, t_type: str | None = None, date_from: date | None = None,
+                   date_to: date | None = None) -> list[int]:
+        raise NotImplementedError
+
+    def category_totals(self, year: int, month: int, t_type: str) -> dict[str, float]:
+        raise NotImplementedError
+
+    def daily_totals(self, t_type: str, ordinal_from: int, ordinal_to: int) -> dict[tuple[int, str], int]:
+        raise NotImplementedError
+
+    def balance_cents(self) -> int:
+        raise NotImplementedError
+
+    def count_rows(self, ordinal_from: int, ordinal_to: int) -> int:
+        raise NotImplementedError
+
+    @property
+    def uncommitted(self) -> bool:
+        # Whether this session holds changes that other connections to the file cannot see yet
+        return False
+
+
+class JsonBackend(StorageBackend):
+    # The transactions.json snapshot, optionally with an append-only journal next to it.
+    # When shared, writes hold an exclusive lock on <file>.lock (which also stores the next id),
+    # the journal is replayed from where this session last read it, and a rewrite of the snapshot
+    # by another session (a save or a compaction) triggers a full reload.
+
+    def __init__(self, filename: str, journaled: bool = False, compact_threshold: int = 1000,
+                 shared: bool = False) -> None:
+        super().__init__(filename, shared)
+        self.journaled: bool = journaled
+        self.compact_threshold: int = compact_threshold
+        self._journal_entries: int = 0
+        # Where this session stopped reading the journal, and which snapshot it loaded
+        self._journal_offset: int = 0
+        self._snapshot_stamp: tuple[int, int, int] | None = None
+        # Ids changed since the last save, when changes are not journaled
+        self._pending: set[int] = set()
+        self._lock_file: IO[str] | None = None
+        self._lock_depth: int = 0
+        # Journal lines held back by batch() until it exits
+        self._batch: list[str] | None = None
+
+    @property
+    def journal_filename(self) -> str:
+        return f"{self.filename}.log"
+
+    @property
+    def lock_filename(self) -> str:
+        return f"{self.filename}.lock"
+
+    @contextmanager
+    def locked(self) -> Iterator[IO[str] | None]:
+        # Reentrant within the session, so a save can merge, write and compact under one lock
+        if not self.shared:
+            yield None
+            return
+
+        if not self._lock_depth:
+            lock_file = open(os.open(self.lock_filename, os.O_RDWR | os.O_CREAT), "r+", encoding="utf-8")
+            _lock(lock_file)
+            self._lock_file = lock_file
+        self._lock_depth += 1
+        try:
+            yield self._lock_file
+        finally:
+            self._lock_depth -= 1
+            if not self._lock_depth:
+                lock_file, self._lock_file = self._lock_file, None
+                _unlock(lock_file)
+                lock_file.close()
+
+    def _stamp(self) -> tuple[int, int, int] | None:
+        # The snapshot is only ever replaced by a rename, so a new inode/mtime/size means another rewrite
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def load(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> None:
+        with self.locked():
+            self._snapshot_stamp = self._stamp()
+            if self._snapshot_stamp is not None:
+                self.bytes_read += self._snapshot_stamp[2]
+                with open(self.filename, "r", encoding="utf-8") as json_file:
+                    for batch in _iter_json_array(json_file):
+                        batch_records = TransactionRecord.from_dicts(batch)
+                        records.update(zip(map(_get_id, batch_records), batch_records))
+
+            self._journal_entries = 0
+            self._journal_offset = 0
+            if self.journaled:
+                self._replay_journal(records)
+
+    def _replay_journal(self, records: MutableMapping[int, Transaction | TransactionRecord],
+                        changes: Changes | None = None) -> int:
+        # Applies the journal from where this session last stopped; returns the number of entries read.
+        # With changes, records the previous record of every id whose contents changed
+        if not exists(self.journal_filename):
+            return 0
+
+        replayed = 0
+        with open(self.journal_filename, "rb") as log_file:
+            log_file.seek(self._journal_offset)
+            for line in log_file:
+                if not line.endswith(b"\n"):
+                    # A crash mid-append leaves a torn last line. It is left for the next append to
+                    # seal, so the next replay starts at the beginning of an entry
+                    break
+                try:
+                    entry: dict[str, Any] = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn line that a later append sealed; the entries after it are valid
+                    self._journal_offset += len(line)
+                    continue
+
+                # Entries are idempotent so a log that survived a compaction can be replayed safely
+                op = entry.pop("op")
+                transaction_id = entry["id"]
+                if changes is None:
+                    if op == "put":
+                        records[transaction_id] = TransactionRecord.from_dict(entry)
+                    elif op == "del":
+                        records.pop(transaction_id, None)
+                elif op == "put":
+                    previous = records.get(transaction_id)
+                    # This session's own entries match what it holds and are skipped
+                    if previous is None or previous.to_dict() != entry:
+                        changes.setdefault(transaction_id, previous)
+                        records[transaction_id] = TransactionRecord.from_dict(entry)
+                elif op == "del" and transaction_id in records:
+                    changes.setdefault(transaction_id, records.pop(transaction_id))
+                self._journal_offset += len(line)
+                self.bytes_read += len(line)
+                replayed += 1
+
+        self._journal_entries += replayed
+        return replayed
+
+    def _journal(self, entries: Iterable[dict[str, Any]]) -> None:
+        lines = [json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n" for entry in entries]
+        if self._batch is not None:
+            self._batch.extend(lines)
+        elif lines:
+            self._append(lines, durable=False)
+
+    def _append(self, lines: list[str], durable: bool) -> None:
+        data = "".join(lines).encode()
+        with self.locked(), open(self.journal_filename, "ab+") as log_file:
+            end = log_file.seek(0, os.SEEK_END)
+            if end:
+                log_file.seek(end - 1)
+                if log_file.read(1) != b"\n":
+                    # The log ends in a torn line: end it, or this entry would be glued to it and lost
+                    data = b"\n" + data
+            log_file.write(data)
+            if end == self._journal_offset:
+                # Nobody else appended since this session last read the log, so its own lines need
+                # not be replayed
+                self._journal_offset += len(data)
+            self.bytes_written += len(data)
+            if durable:
+                log_file.flush()
+                os.fsync(log_file.fileno())
+        self._journal_entries += len(lines)
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if not self.journaled or self._batch is not None:
+            yield
+            return
+
+        self._batch = []
+        try:
+            yield
+        finally:
+            lines, self._batch = self._batch, None
+            if lines:
+                self._append(lines, durable=True)
+
+    def put(self, transactions: Sequence[Transaction]) -> None:
+        if self.journaled:
+            self._journal({"op": "put", **t.to_dict()} for t in transactions)
+        elif self.shared:
+            self._pending.update(t.id for t in transactions)
+
+    def delete(self, transaction_ids: Sequence[int]) -> None:
+        if self.journaled:
+            self._journal({"op": "del", "id": transaction_id} for transaction_id in transaction_ids)
+        elif self.shared:
+            self._pending.update(transaction_ids)
+
+    def allocate_ids(self, count: int, floor: int) -> int:
+        if not self.shared:
+            return floor
+
+        with self.locked() as lock_file:
+            lock_file.seek(0)
+            stored = lock_file.read().strip()
+            first = max(int(stored) if stored else 0, floor)
+            # Fixed width, so the counter is overwritten in place without truncating the file
+            lock_file.seek(0)
+            lock_file.write(f"{first + count:>20}\n")
+            lock_file.flush()
+        return first
+
+    def refresh(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> Changes | None:
+        if not self.shared:
+            return {}
+
+        with self.locked():
+            if self._stamp() == self._snapshot_stamp:
+                # Only other sessions' journal entries, applied one by one
+                changes: Changes = {}
+                if self.journaled:
+                    self._replay_journal(records, changes)
+                return changes
+
+            # Another session rewrote the snapshot: reload it and put this session's unsaved changes back
+            pending = {transaction_id: records.get(transaction_id) for transaction_id in self._pending}
+            records.clear()
+            self.load(records)
+            for transaction_id, transaction in pending.items():
+                if transaction is None:
+                    records.pop(transaction_id, None)
+                else:
+                    records[transaction_id] = transaction
+            return None
+
+    def save(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        if not self.journaled:
+            self.rewrite(transactions)
+        elif self._journal_entries >= self.compact_threshold:
+            self.compact(transactions)
+
+    def compact(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        with self.locked():
+            self.rewrite(transactions)
+            if exists(self.journal_filename):
+                os.remove(self.journal_filename)
+            self._journal_entries = 0
+            self._journal_offset = 0
+
+    def rewrite(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        transaction_data = [t.to_dict() for t in transactions]
+
+        # Write next to the target and rename over it, so a crash never leaves a torn file
+        with self.locked():
+            temp_filename = f"{self.filename}.tmp"
+            with open(temp_filename, 'w', encoding="utf-8") as json_file:
+                json.dump(transaction_data, json_file, ensure_ascii=False, indent=4)
+                json_file.flush()
+                os.fsync(json_file.fileno())
+            os.replace(temp_filename, self.filename)
+            self._snapshot_stamp = self._stamp()
+            self.bytes_written += self._snapshot_stamp[2]
+            self._pending.clear()
+
+
+class SqliteBackend(StorageBackend):
+    # Typed rows with amounts as integer cents and dates as day ordinals, indexed by date and category.
+    # Every change is committed as it happens, so save() has nothing left to write.
+    supports_queries = True
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS transactions (
+            id INTEGER PRIMARY KEY,
+            t_type TEXT NOT NULL,
+            cents INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            description TEXT,
+            ordinal INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_transactions_ordinal ON transactions (ordinal);
+        CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions (category, ordinal);
+    """
+
+    def __init__(self, filename: str, shared: bool = False) -> None:
+        super().__init__(filename, shared)
+        self._connection: sqlite3.Connection | None = None
+        # PRAGMA data_version as of the last load; it changes when another connection commits
+        self._data_version: int | None = None
+        self._batching: bool = False
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            # Connections may be shared by a thread-safe FinanceManager, which serializes the calls
+            self._connection = sqlite3.connect(self.filename, timeout=30, check_same_thread=False)
+            if self.shared:
+                # Write-ahead logging lets readers and the writer work at the same time
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(self._SCHEMA)
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def load(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> None:
+        cursor = self.connection.execute(
+            "SELECT id, t_type, cents, category, description, ordinal FROM transactions ORDER BY id")
+        new = partial(tuple.__new__, TransactionRecord)
+        while rows := cursor.fetchmany(10_000):
+            batch_records = [new((transaction_id, t_type, cents, category, description, _from_ordinal(ordinal)))
+                             for transaction_id, t_type, cents, category, description, ordinal in rows]
+            records.update(zip(map(_get_id, batch_records), batch_records))
+        self._data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def allocate_ids(self, count: int, floor: int) -> int:
+        if not self.shared:
+            return floor
+
+        # BEGIN IMMEDIATE takes the write lock, so two sessions never read the same counter. Inside a
+        # batch() the open transaction has already written, so it holds that lock
+        connection = self.connection
+        own_transaction = not connection.in_transaction
+        if own_transaction:
+            connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute("CREATE TABLE IF NOT EXISTS id_sequence (next_id INTEGER NOT NULL)")
+            stored, = connection.execute(
+                "SELECT max(coalesce((SELECT max(next_id) FROM id_sequence), 1), "
+                "coalesce((SELECT max(id) FROM transactions), 0) + 1)").fetchone()
+            first = max(stored, floor)
+            connection.execute("DELETE FROM id_sequence")
+            connection.execute("INSERT INTO id_sequence VALUES (?)", (first + count,))
+        except BaseException:
+            if own_transaction:
+                connection.rollback()
+            raise
+        if own_transaction:
+            connection.commit()
+        return first
+
+    def refresh(self, records: MutableMapping[int, Transaction | TransactionRecord]) -> Changes | None:
+        # Every change is committed as it happens, so other sessions' rows are simply read again
+        if not self.shared or self.connection.execute("PRAGMA data_version").fetchone()[0] == self._data_version:
+            return {}
+        records.clear()
+        self.load(records)
+        return None
+
+    @staticmethod
+    def _row(transaction: Transaction | TransactionRecord) -> tuple[Any, ...]:
+        return (transaction.id, transaction.t_type, transaction.cents, transaction.category,
+                transaction.description, transaction.ordinal)
+
+    def _writing(self) -> AbstractContextManager[Any]:
+        # Commits right away, unless a batch() will commit everything at once
+        return nullcontext() if self._batching else self.connection
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        if self._batching:
+            yield
+            return
+
+        self._batching = True
+        try:
+            yield
+        finally:
+            self._batching = False
+            self.connection.commit()
+
+    def put(self, transactions: Sequence[Transaction]) -> None:
+        with self._writing():
+            self.connection.executemany("INSERT OR REPLACE INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+                                        map(self._row, transactions))
+
+    def delete(self, transaction_ids: Sequence[int]) -> None:
+        with self._writing():
+            self.connection.executemany("DELETE FROM transactions WHERE id = ?",
+                                        ((transaction_id,) for transaction_id in transaction_ids))
+
+    def rewrite(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        with self.connection:
+            self.connection.execute("DELETE FROM transactions")
+            self.connection.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?)",
+                                        map(self._row, transactions))
+
+    def compact(self, transactions: Iterable[Transaction | TransactionRecord]) -> None:
+        self.rewrite(transactions)
+        self.connection.execute("VACUUM")
+
+    def filter_ids(self, category: str | None = None, t_type: str | None = None, date_from: date | None = None,
+                   date_to: date | None = None) -> list[int]:
+        conditions, parameters = [], []
+        if category:
+            conditions.append("category = ?")
+            parameters.append(category.lower())
+        if t_type:
+            conditions.append("lower(t_type) = ?")
+            parameters.append(t_type.lower())
+        if date_from:
+            conditions.append("ordinal >= ?")
+            parameters.append(date_from.toordinal())
+        if date_to:
+            conditions.append("ordinal <= ?")
+            parameters.append(date_to.toordinal())
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(f"SELECT id FROM transactions {where} ORDER BY id", parameters)
+        return [transaction_id for transaction_id, in rows]
+
+    def category_totals(self, year: int, month: int, t_type: str) -> dict[str, float]:
+        first_day = date(year, month, 1)
+        next_month = date(year + month // 12, month % 12 + 1, 1)
+        rows = self.connection.execute(
+            "SELECT category, SUM(cents) FROM transactions WHERE t_type = ? AND ordinal >= ? AND ordinal < ? "
+            "GROUP BY category ORDER BY MIN(id)",
+            (t_type, first_day.toordinal(), next_month.toordinal()))
+        return {category: cents / 100 for category, cents in rows}
+
+    def daily_totals(self, t_type: str, ordinal_from: int, ordinal_to: int) -> dict[tuple[int, str], int]:
+        rows = self.connection.execute(
+            "SELECT ordinal, category, SUM(cents) FROM transactions "
+            "WHERE t_type = ? AND ordinal BETWEEN ? AND ? GROUP BY ordinal, category ORDER BY ordinal, MIN(id)",
+            (t_type, ordinal_from, ordinal_to))
+        return {(ordinal, category): cents for ordinal, category, cents in rows}
+
+    def count_rows(self, ordinal_from: int, ordinal_to: int) -> int:
+        # Answered from the ordinal index
+        return self.connection.execute("SELECT COUNT(*) FROM transactions WHERE ordinal BETWEEN ? AND ?",
+                                       (ordinal_from, ordinal_to)).fetchone()[0]
+
+    @property
+    def uncommitted(self) -> bool:
+        return self.connection.in_transaction
+
+    def balance_cents(self) -> int:
+        row = self.connection.execute(
+            "SELECT SUM(CASE t_type WHEN 'Ingreso' THEN cents WHEN 'Gasto' THEN -cents ELSE 0 END) "
+            "FROM transactions").fetchone()
+        return row[0] or 0
+
+
+def open_backend(filename: str, **options: Any) -> StorageBackend:
+    if splitext(filename)[1].lower() in SQLITE_EXTENSIONS:
+        return SqliteBackend(filename, shared=options.get("shared", False))
+    return JsonBackend(filename, **options)
+
+
+def migrate(source: StorageBackend, destination: StorageBackend) -> int:
+    records: dict[int, Transaction | TransactionRecord] = {}
+    source.load(records)
+    destination.compact(records.values())
+    return len(records)
+
+
+def main(arguments: list[str]) -> None:
+    if len(arguments) != 2:
+        print("Uso: python storage.py <origen> <destino>  (p. ej. transactions.json transactions.db)")
+        sys.exit(2)
+
+    source_filename, destination_filename = arguments
+    # A journaled source is read together with its log, so nothing pending is left behind
+    source = open_backend(source_filename, journaled=True)
+    if not exists(source_filename) and not exists(getattr(source, "journal_filename", source_filename)):
+        print(f"No existe el archivo {source_filename}")
+        sys.exit(1)
+
+    count = migrate(source, open_backend(destination_filename, journaled=True))
+    print(f"Se migraron {count} transacciones de {source_filename} a {destination_filename}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
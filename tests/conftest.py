@@ -0,0 +1,18 @@
+from collections.abc import Callable
+from datetime import date
+
+import pytest
+
+from manager import FinanceManager
+from models import Transaction
+
+
+@pytest.fixture
+def fill() -> Callable[[FinanceManager], None]:
+    # Adds the same small ledger to a manager: expenses on 01/01, 30/01 and 01/02/2001, an income on 15/01
+    def add(manager: FinanceManager) -> None:
+        manager.add_transactions([Transaction("Gasto", 5000, "Comida", "Almuerzo", date(2001, 1, 1)),
+                                  Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 1, 15)),
+                                  Transaction("Gasto", 1000, "Transporte", transaction_date=date(2001, 1, 30)),
+                                  Transaction("Gasto", 2000, "Comida", transaction_date=date(2001, 2, 1))])
+    return add
@@ -0,0 +1,72 @@
+from datetime import date
+
+import pytest
+
+import aggregation
+
+from aggregation import periods
+from manager import FinanceManager
+from models import Transaction
+
+
+class TestSummaryRange:
+    @pytest.mark.parametrize("filename", ["transactions.json", "transactions.db"])
+    def test_monthly_range_matches_monthly_summary(self, tmp_path, fill, filename) -> None:
+        manager = FinanceManager(str(tmp_path / filename))
+        fill(manager)
+
+        summary = manager.summary_range(date(2000, 12, 1), date(2002, 12, 31))
+        assert list(summary) == periods(date(2000, 12, 1), date(2002, 12, 31), "month")
+        for period, categories in summary.items():
+            assert categories == manager.get_monthly_summary_by_category(period.month, period.year)
+
+        assert manager.summary_range(date(2001, 1, 1), date(2001, 12, 31), "year") == {
+            date(2001, 1, 1): [("comida", 7000), ("transporte", 1000)]}
+        assert manager.summary_range(date(2001, 1, 1), date(2001, 1, 31), "quarter", "Ingreso") == {
+            date(2001, 1, 1): [("salario", 10000)]}
+
+    @pytest.mark.parametrize("start, end", [(date(2000, 12, 31), date(2001, 3, 1)), (date(2001, 1, 2), date(2001, 3, 31)),
+                                            (date(2001, 1, 31), date(2001, 2, 27))])
+    def test_partial_months_at_the_edges(self, fill, start, end) -> None:
+        manager = FinanceManager("missing.json")
+        fill(manager)
+
+        by_day = manager.summary_range(start, end, "day")
+        expected = {}
+        for day, categories in by_day.items():
+            month = expected.setdefault(day.replace(day=1), {})
+            for category, amount in categories:
+                month[category] = month.get(category, 0) + amount
+        assert {month: dict(categories) for month, categories in manager.summary_range(start, end).items()} == expected
+
+    @pytest.mark.parametrize("filename", ["transactions.json", "transactions.db"])
+    def test_partitioned_workers_match_single_pass(self, tmp_path, fill, filename) -> None:
+        manager = FinanceManager(str(tmp_path / filename))
+        fill(manager)
+
+        expected = manager.summary_range(date(2000, 1, 1), date(2002, 12, 31), "week", workers=1)
+        assert manager.summary_range(date(2000, 1, 1), date(2002, 12, 31), "week", workers=3) == expected
+        assert expected[date(2001, 1, 1)] == [("comida", 5000)]
+        # The week of 29/01 runs into February
+        assert expected[date(2001, 1, 29)] == [("comida", 2000), ("transporte", 1000)]
+
+    def test_sqlite_workers_follow_the_range(self, tmp_path, monkeypatch, fill) -> None:
+        manager = FinanceManager(str(tmp_path / "transactions.db"))
+        fill(manager)
+        sized = []
+        monkeypatch.setattr(aggregation, "default_workers", lambda rows: sized.append(rows) or 1)
+
+        manager.summary_range(date(2001, 1, 1), date(2001, 1, 31), "week")
+        manager.summary_range(date(2000, 1, 1), date(2002, 12, 31))
+        assert sized == [3, 4]
+
+        # Rows not committed yet are invisible to worker connections, so the range is read in-process
+        with manager.storage.batch():
+            manager.add_transaction(Transaction("Gasto", 700, "Comida", transaction_date=date(2001, 1, 2)),
+                                    show_message=False)
+            assert manager.summary_range(date(2001, 1, 1), date(2001, 1, 7), "week", workers=3) == {
+                date(2001, 1, 1): [("comida", 5700)]}
+
+    def test_unknown_grouping_is_rejected(self) -> None:
+        with pytest.raises(ValueError):
+            FinanceManager("missing.json").summary_range(date(2001, 1, 1), date(2001, 12, 31), "decade")
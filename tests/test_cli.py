@@ -0,0 +1,110 @@
+import json
+
+from datetime import date
+
+import pytest
+
+import cli
+
+from manager import FinanceManager
+from models import Transaction
+
+
+class TestScriptingApi:
+    def test_update_transaction_keeps_balance_and_indexes(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        manager.add_transactions([Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)),
+                                  Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 1, 15))])
+        assert manager.get_monthly_summary_by_category(1, 2001) == [("comida", 5000)]
+
+        updated = manager.update_transaction(1, amount=2000, category="Ocio", transaction_date=date(2001, 2, 3))
+        assert updated.category == "ocio"
+        assert manager.balance == 8000
+        assert manager.get_monthly_summary_by_category(1, 2001) == []
+        assert manager.get_monthly_summary_by_category(2, 2001) == [("ocio", 2000)]
+
+        manager.update_transaction(2, t_type="gasto")
+        assert manager.balance == -12000
+        assert manager.update_transaction(99, amount=1) is None
+
+    def test_invalid_update_leaves_the_transaction_untouched(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        manager.add_transactions([Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)),
+                                  Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 1, 15))])
+        assert manager.get_monthly_summary_by_category(1, 2001) == [("comida", 5000)]
+
+        for fields in ({"transaction_date": None}, {"transaction_date": "01/01/01"}, {"amount": "10"},
+                       {"amount": True}, {"amount": float("nan")}, {"amount": 0.001}, {"category": None},
+                       {"category": ""}, {"description": 5}, {"t_type": None}, {"t_type": "otro"}):
+            with pytest.raises(ValueError):
+                # A valid change alongside the bad one is not applied either
+                manager.update_transaction(1, **{"amount": 20, **fields})
+
+        assert manager.find_transaction_by_id(1).to_dict() == {
+            "id": 1, "t_type": "Gasto", "amount": 5000, "category": "comida", "description": None,
+            "transaction_date": "01/01/01"}
+        assert manager.balance == 5000
+        assert manager.get_monthly_summary_by_category(1, 2001) == [("comida", 5000)]
+        assert [t.id for t in manager.filter_transactions(date_from=date(2001, 1, 1))] == [1, 2]
+
+    def test_edit_prompt_rejects_amounts_that_round_to_nothing(self, tmp_path, monkeypatch) -> None:
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida"), show_message=False)
+
+        # Amount (asked again until valid), category, description, date
+        answers = iter(["inf", "nan", "0.004", "12.5", "", "", ""])
+        monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+        manager.edit_transaction(1)
+
+        assert manager.find_transaction_by_id(1).amount == 12.5
+        assert manager.balance == -12.5
+
+    def test_delete_transaction_without_prompt(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida"), show_message=False)
+
+        assert manager.delete_transaction(1).id == 1
+        assert manager.delete_transaction(1) is None
+        assert len(manager) == 0 and manager.balance == 0
+
+
+class TestCli:
+    def test_commands_run_without_prompts(self, tmp_path, capsys) -> None:
+        filename = str(tmp_path / "transactions.json")
+
+        assert cli.main(["-f", filename, "add", "Gasto,5000,Comida,Almuerzo,01/01/01",
+                         "ingreso,10000,salario,,15/01/01", "Gasto,1000,Transporte,,30/01/01"]) == 0
+        assert cli.main(["-f", filename, "update", "3", "--category", "ocio"]) == 0
+        assert cli.main(["-f", filename, "delete", "2", "7"]) == 1
+        capsys.readouterr()
+
+        assert cli.main(["-f", filename, "summary", "01/2001", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"01/2001": {"comida": 5000, "ocio": 1000}}
+        assert cli.main(["-f", filename, "filter", "--from", "15/01/01", "--json"]) == 0
+        assert [t["id"] for t in json.loads(capsys.readouterr().out)] == [3]
+        assert cli.main(["-f", filename, "balance", "--json"]) == 0
+        assert json.loads(capsys.readouterr().out) == {"balance": -6000}
+
+    def test_invalid_record_adds_nothing(self, tmp_path, capsys) -> None:
+        filename = str(tmp_path / "transactions.json")
+
+        assert cli.main(["-f", filename, "add", "Gasto,5000,Comida", "Gasto,-1,Comida"]) == 1
+        assert "Registro 2" in capsys.readouterr().err
+        assert len(FinanceManager(filename, journaled=True)) == 0
+
+    def test_empty_search_is_an_error(self, tmp_path, capsys) -> None:
+        filename = str(tmp_path / "transactions.json")
+        assert cli.main(["-f", filename, "add", "Gasto,5000,Comida"]) == 0
+        capsys.readouterr()
+
+        assert cli.main(["-f", filename, "filter", "--search", ""]) == 2
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.parametrize("amount", ["inf", "nan", "0.004"])
+    def test_record_amount_follows_update_rules(self, tmp_path, capsys, amount) -> None:
+        # Adding accepts the same amounts as update_transaction: finite and worth at least a cent
+        filename = str(tmp_path / "transactions.json")
+
+        assert cli.main(["-f", filename, "add", f"Gasto,{amount},Comida"]) == 1
+        assert "el monto debe ser positivo" in capsys.readouterr().err
+        assert len(FinanceManager(filename, journaled=True)) == 0
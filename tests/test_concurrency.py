@@ -0,0 +1,127 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from multiprocessing import get_context
+
+import pytest
+
+from manager import FinanceManager
+from models import Transaction
+
+WRITERS = 4
+TRANSACTIONS_PER_WRITER = 30
+
+
+def _write(filename: str, journaled: bool, writer: int) -> None:
+    manager = FinanceManager(filename, journaled=journaled, compact_threshold=7, shared=True)
+    for number in range(TRANSACTIONS_PER_WRITER):
+        manager.add_transaction(Transaction("Gasto", 1, "comida", f"w{writer}-{number}", date(2001, 1, 1)),
+                                show_message=False)
+        if number % 5 == 4:
+            manager.save_to_file()
+    manager.save_to_file()
+
+
+class TestSharedFile:
+    @pytest.mark.parametrize("filename", ["transactions.json", "transactions.db"])
+    @pytest.mark.parametrize("journaled", [False, True])
+    def test_concurrent_writers_lose_nothing(self, tmp_path, filename, journaled) -> None:
+        test_file = str(tmp_path / filename)
+        context = get_context("spawn")
+        writers = [context.Process(target=_write, args=(test_file, journaled, writer)) for writer in range(WRITERS)]
+        for process in writers:
+            process.start()
+        for process in writers:
+            process.join(60)
+            assert process.exitcode == 0
+
+        manager = FinanceManager(test_file, journaled=journaled)
+        descriptions = [t.description for t in manager.transactions]
+        assert len(manager) == WRITERS * TRANSACTIONS_PER_WRITER
+        assert sorted(descriptions) == sorted(f"w{writer}-{number}" for writer in range(WRITERS)
+                                              for number in range(TRANSACTIONS_PER_WRITER))
+        assert len({t.id for t in manager.transactions}) == len(manager)
+        assert manager.balance == -WRITERS * TRANSACTIONS_PER_WRITER
+
+    @pytest.mark.parametrize("journaled", [False, True])
+    def test_save_merges_other_sessions(self, tmp_path, journaled) -> None:
+        test_file = str(tmp_path / "transactions.json")
+        first = FinanceManager(test_file, journaled=journaled, shared=True)
+        first.add_transaction(Transaction("Gasto", 10, "comida", "inicial"), show_message=False)
+        first.save_to_file()
+
+        second = FinanceManager(test_file, journaled=journaled, shared=True)
+        first.add_transaction(Transaction("Gasto", 20, "comida", "primera"), show_message=False)
+        second.add_transaction(Transaction("Ingreso", 100, "salario", "segunda"), show_message=False)
+        second.delete_transaction(1)
+        first.save_to_file()
+        second.save_to_file()
+
+        # The ids were handed out by the shared counter, and the last save kept the other session's work
+        assert sorted(t.id for t in second.transactions) == [2, 3]
+        assert second.balance == 80
+        new_manager = FinanceManager(test_file, journaled=journaled)
+        assert sorted(t.description for t in new_manager.transactions) == ["primera", "segunda"]
+
+    @pytest.mark.parametrize("columnar", [False, True])
+    def test_saves_keep_indexes_warm(self, tmp_path, columnar) -> None:
+        test_file = str(tmp_path / "transactions.json")
+        first = FinanceManager(test_file, journaled=True, shared=True, columnar=columnar)
+        first.add_transactions([Transaction("Gasto", 10, "comida", transaction_date=date(2001, 1, 1)),
+                                Transaction("Gasto", 20, "ocio", transaction_date=date(2001, 1, 2))])
+        first.save_to_file()
+        second = FinanceManager(test_file, journaled=True, shared=True)
+        first.warm_up()
+        generation, _ = first.data_version(1, 2001)
+
+        # A session's own journal entries are not read back
+        first.add_transaction(Transaction("Ingreso", 100, "salario", transaction_date=date(2001, 1, 3)),
+                              show_message=False)
+        first.save_to_file()
+        assert not first.sync()
+
+        # Another session's entries are applied one by one instead of reloading everything
+        second.update_transaction(1, amount=15, category="ocio")
+        second.delete_transaction(2)
+        second.add_transaction(Transaction("Gasto", 5, "comida", "taxi", date(2001, 2, 1)), show_message=False)
+        second.save_to_file()
+        assert first.sync()
+
+        assert first.data_version(1, 2001)[0] == generation
+        assert first.balance == 80
+        assert first.next_id == 5
+        assert first.get_monthly_summary_by_category(1, 2001) == [("ocio", 15)]
+        assert first.get_monthly_summary_by_category(2, 2001) == [("comida", 5)]
+        assert [t.id for t in first.filter_transactions(date_from=date(2001, 1, 1))] == [1, 3, 4]
+        assert [t.id for t in first.search("taxi")] == [4]
+
+    def test_sync_reads_other_sessions(self, tmp_path) -> None:
+        test_file = str(tmp_path / "transactions.db")
+        first = FinanceManager(test_file, shared=True)
+        second = FinanceManager(test_file, shared=True)
+        first.add_transaction(Transaction("Gasto", 10, "comida"), show_message=False)
+
+        assert [t.id for t in second.filter_transactions(category="comida")] == [1]
+        assert second.balance == -10
+        assert not second.sync()
+
+
+class TestThreadSafe:
+    @pytest.mark.parametrize("filename", ["transactions.json", "transactions.db"])
+    def test_worker_pool(self, tmp_path, filename) -> None:
+        manager = FinanceManager(str(tmp_path / filename), journaled=True, shared=True, thread_safe=True)
+
+        def work(writer: int) -> None:
+            for number in range(50):
+                manager.add_transaction(Transaction("Ingreso", 2, "ventas", f"w{writer}-{number}"),
+                                        show_message=False)
+                manager.get_monthly_summary_by_category(1, 2001)
+                manager.filter_transactions(category="ventas")
+
+        with ThreadPoolExecutor(8) as pool:
+            list(pool.map(work, range(8)))
+        manager.save_to_file()
+
+        assert len(manager) == 400
+        assert len({t.id for t in manager.transactions}) == 400
+        assert manager.balance == 800
+        assert manager.verify_balance()
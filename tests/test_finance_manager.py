@@ -1,9 +1,14 @@
+import json
+import os
 import pytest
+import subprocess
+import sys
 
 from datetime import date
 
 from manager import FinanceManager
-from models import Transaction
+from storage import _iter_json_array
+from models import Transaction, TransactionRecord, parse_date
 
 class TestFinanceManager:
     def test_add_transaction(self) -> None:
@@ -34,6 +39,23 @@ class TestFinanceManager:
         assert t_found.amount == 5000
         assert manager.find_transaction_by_id(999) is None
 
+    def test_delete_transactions(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"))
+        t1 = Transaction("Gasto", 5000, "Comida")
+        t2 = Transaction("Ingreso", 10000, "Salario")
+        t3 = Transaction("Gasto", 1000, "comida")
+        manager.add_transaction(t1)
+        manager.add_transaction(t2)
+        manager.add_transaction(t3)
+
+        deleted = manager.delete_transactions([3, 1, 999])
+
+        assert deleted == [t3, t1]
+        assert manager.transactions == [t2]
+        assert manager.find_transaction_by_id(1) is None
+        assert manager.find_transaction_by_id(2) == t2
+        assert manager.balance == 10000
+
     def test_filter_by_category(self) -> None:
         manager = FinanceManager()
         t1 = Transaction("Gasto", 5000, "Comida")
@@ -106,6 +128,7 @@ class TestFinanceManager:
         new_manager.load_from_file()
 
         assert len(new_manager.transactions) == 3
+        assert new_manager.find_transaction_by_id(3).transaction_date == date(2001, 12, 30)
         assert new_manager.transactions[0].category == "comida"
         assert new_manager.transactions[1].amount == 10000
         assert new_manager.balance == 4000
@@ -122,4 +145,410 @@ class TestFinanceManager:
         result1 = manager.get_monthly_summary_by_category(1, 2001)
         result2 = manager.get_monthly_summary_by_category(6, 2001)
         assert result1 == [('comida', 5000), ('transporte', 1000)]
-        assert result2 == []
\ No newline at end of file
+        assert result2 == []
+
+class TestTransaction:
+    def test_compact_layout_keeps_output(self) -> None:
+        t = Transaction("Gasto", 5000, "Comida", "Almuerzo con amigos", date(2001, 1, 30))
+        t.id = 7
+
+        assert not hasattr(t, "__dict__")
+        assert t.category is Transaction("Gasto", 1, "COMIDA").category
+        assert t.ordinal == date(2001, 1, 30).toordinal()
+        assert t.to_dict() == {
+            "id": 7,
+            "t_type": "Gasto",
+            "amount": 5000,
+            "category": "comida",
+            "description": "almuerzo con amigos",
+            "transaction_date": "30/01/01"
+        }
+        assert str(t) == "[7] Gasto    | $5,000.00       | Comida        | Almuerzo con amigos | 30/01/01"
+
+        t.transaction_date = date(2001, 2, 1)
+        assert t.transaction_date == date(2001, 2, 1)
+
+class TestJournal:
+    def test_changes_are_replayed_from_journal(self, tmp_path, monkeypatch) -> None:
+        test_file = str(tmp_path / "test_transactions.json")
+
+        manager = FinanceManager(test_file, journaled=True)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+        manager.add_transaction(Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 6, 15)))
+        manager.add_transaction(Transaction("Gasto", 1000, "comida", transaction_date=date(2001, 12, 30)))
+
+        # Amount, category, description, date
+        answers = iter(["2000", "", "", ""])
+        monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+        manager.edit_transaction(1)
+        monkeypatch.setattr("builtins.input", lambda _="": "s")
+        manager.delete_transaction(3)
+        manager.save_to_file()
+
+        new_manager = FinanceManager(test_file, journaled=True)
+
+        assert [t.id for t in new_manager.transactions] == [1, 2]
+        assert new_manager.transactions[0].amount == 2000
+        assert new_manager.balance == 8000
+        assert new_manager.next_id == 3
+
+    def test_compaction_folds_journal_into_snapshot(self, tmp_path) -> None:
+        test_file = tmp_path / "test_transactions.json"
+        journal_file = tmp_path / "test_transactions.json.log"
+
+        manager = FinanceManager(str(test_file), journaled=True, compact_threshold=3)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida"))
+        manager.add_transaction(Transaction("Ingreso", 10000, "Salario"))
+        manager.save_to_file()
+
+        assert not test_file.exists()
+        assert len(journal_file.read_text(encoding="utf-8").splitlines()) == 2
+
+        manager.add_transaction(Transaction("Gasto", 1000, "comida"))
+        manager.save_to_file()
+
+        assert not journal_file.exists()
+        assert len(FinanceManager(str(test_file)).transactions) == 3
+
+    def test_torn_journal_line_is_ignored(self, tmp_path) -> None:
+        test_file = str(tmp_path / "test_transactions.json")
+
+        manager = FinanceManager(test_file, journaled=True)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida"))
+        with open(manager.storage.journal_filename, "a", encoding="utf-8") as log_file:
+            log_file.write('{"op":"put","id":2,"t_ty')
+
+        new_manager = FinanceManager(test_file, journaled=True)
+
+        assert len(new_manager.transactions) == 1
+        assert new_manager.balance == -5000
+
+    def test_appending_after_a_torn_line_keeps_new_entries(self, tmp_path) -> None:
+        test_file = str(tmp_path / "test_transactions.json")
+
+        manager = FinanceManager(test_file, journaled=True)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida"))
+        with open(manager.storage.journal_filename, "a", encoding="utf-8") as log_file:
+            log_file.write('{"op":"put","id":2,"t_ty')
+
+        manager = FinanceManager(test_file, journaled=True)
+        manager.add_transaction(Transaction("Ingreso", 10000, "Salario"))
+        manager.add_transaction(Transaction("Gasto", 1000, "Comida"))
+        manager.save_to_file()
+
+        new_manager = FinanceManager(test_file, journaled=True)
+        assert len(new_manager) == 3
+        assert new_manager.balance == 4000
+
+
+class TestColumnarStore:
+    def _managers(self, tmp_path) -> tuple[FinanceManager, FinanceManager]:
+        managers = (FinanceManager(str(tmp_path / "list.json")),
+                    FinanceManager(str(tmp_path / "columnar.json"), columnar=True))
+        for manager in managers:
+            manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+            manager.add_transaction(Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 1, 15)))
+            manager.add_transaction(Transaction("Gasto", 1000, "transporte", transaction_date=date(2001, 1, 30)))
+            manager.add_transaction(Transaction("Gasto", 1000, "comida", transaction_date=date(2001, 2, 1)))
+        return managers
+
+    def test_filters_match_list_store(self, tmp_path) -> None:
+        list_manager, columnar_manager = self._managers(tmp_path)
+        queries = [
+            {},
+            {"category": "Comida"},
+            {"category": "inexistente"},
+            {"t_type": "gasto"},
+            {"date_from": date(2001, 1, 15), "date_to": date(2001, 1, 30)},
+            {"category": "comida", "t_type": "Gasto", "date_to": date(2001, 1, 31)},
+        ]
+
+        for query in queries:
+            expected = [t.id for t in list_manager.filter_transactions(**query)]
+            assert [t.id for t in columnar_manager.filter_transactions(**query)] == expected
+
+    def test_summary_follows_edits_and_deletes(self, tmp_path, monkeypatch) -> None:
+        list_manager, columnar_manager = self._managers(tmp_path)
+
+        for manager in (list_manager, columnar_manager):
+            # Amount, category, description, date
+            answers = iter(["", "comida", "", "10/01/01"])
+            monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+            manager.edit_transaction(3)
+            monkeypatch.setattr("builtins.input", lambda _="": "s")
+            manager.delete_transaction(4)
+
+        assert columnar_manager.get_monthly_summary_by_category(1, 2001) == [("comida", 6000)]
+        assert columnar_manager.get_monthly_summary_by_category(1, 2001) == \
+               list_manager.get_monthly_summary_by_category(1, 2001)
+        assert columnar_manager.get_monthly_summary_by_category(2, 2001) == []
+        assert [t.id for t in columnar_manager.filter_transactions()] == [1, 2, 3]
+
+    def test_filter_returns_the_loaded_transactions(self, tmp_path) -> None:
+        list_manager, _ = self._managers(tmp_path)
+        list_manager.save_to_file()
+        manager = FinanceManager(list_manager.filename, columnar=True)
+
+        # Rows load as records; one is materialized before the store first returns it
+        first = manager.find_transaction_by_id(1)
+        results = manager.filter_transactions(category="comida")
+        assert results[0] is first
+        assert manager.filter_transactions(category="comida") == results
+        assert manager.filter_transactions(t_type="Gasto")[0] is first
+        assert all(isinstance(t, Transaction) for t in manager.filter_transactions())
+
+        manager.update_transaction(4, category="ocio")
+        manager.delete_transaction(1)
+        assert manager.filter_transactions(category="comida") == []
+        assert [t.id for t in manager.filter_transactions(category="ocio")] == [4]
+
+
+class TestDateIndex:
+    def test_filter_follows_date_edits(self, tmp_path, monkeypatch) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"))
+        t1 = Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1))
+        t2 = Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 6, 15))
+        t3 = Transaction("Gasto", 1000, "comida", transaction_date=date(2001, 12, 30))
+        manager.add_transaction(t1)
+        manager.add_transaction(t2)
+        manager.add_transaction(t3)
+
+        # Amount, category, description, date
+        answers = iter(["", "", "", "20/06/01"])
+        monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+        manager.edit_transaction(3)
+        manager.delete_transactions([2])
+
+        assert manager.filter_transactions(date_from=date(2001, 6, 1), date_to=date(2001, 6, 30)) == [t3]
+        assert manager.filter_transactions(category="comida", date_to=date(2001, 12, 31)) == [t1, t3]
+
+
+class TestSummaryCube:
+    def test_summary_follows_edits(self, tmp_path, monkeypatch) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"), debug=True)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+        manager.add_transaction(Transaction("Gasto", 1000, "transporte", transaction_date=date(2001, 1, 30)))
+        manager.add_transaction(Transaction("Gasto", 3000, "transporte", transaction_date=date(2001, 2, 1)))
+
+        # Amount, category, description, date
+        answers = iter(["7000", "", "", "15/02/01"])
+        monkeypatch.setattr("builtins.input", lambda _="": next(answers))
+        manager.edit_transaction(1)
+
+        assert manager.get_monthly_summary_by_category(1, 2001) == [("transporte", 1000)]
+        assert manager.get_monthly_summary_by_category(2, 2001) == [("comida", 7000), ("transporte", 3000)]
+
+    def test_debug_mode_detects_inconsistent_aggregate(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"), debug=True)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+        manager._summary_cube.add(Transaction("Gasto", 1, "Comida", transaction_date=date(2001, 1, 1)))
+
+        with pytest.raises(AssertionError):
+            manager.get_monthly_summary_by_category(1, 2001)
+
+
+class TestSearch:
+    @pytest.mark.parametrize("filename, columnar", [("transactions.json", False), ("transactions.json", True),
+                                                    ("transactions.db", False)])
+    def test_search_follows_changes_and_combines_with_filters(self, tmp_path, filename, columnar) -> None:
+        manager = FinanceManager(str(tmp_path / filename), columnar=columnar)
+        manager.add_transactions([Transaction("Gasto", 15, "Ocio", "Netflix", date(2001, 1, 5)),
+                                  Transaction("Gasto", 20, "Transporte", "Uber", date(2001, 1, 9)),
+                                  Transaction("Gasto", 15, "Ocio", "Netflix", date(2001, 2, 5))])
+
+        assert [t.id for t in manager.search("netflix")] == [1, 3]
+        assert [t.id for t in manager.filter_transactions(date_from=date(2001, 2, 1), text="net*")] == [3]
+
+        manager.update_transaction(2, description="Taxi")
+        manager.delete_transaction(1)
+        manager.add_transaction(Transaction("Gasto", 30, "Transporte", "Uber", date(2001, 3, 1)), False)
+        assert [t.id for t in manager.search("uber OR taxi")] == [2, 4]
+        assert [t.id for t in manager.filter_transactions(category="ocio", text="netflix")] == [3]
+        with pytest.raises(ValueError):
+            manager.search("")
+
+
+class TestStreamingLoad:
+    def test_json_array_is_read_in_batches(self, tmp_path) -> None:
+        test_file = tmp_path / "test_transactions.json"
+        records = [{"nested": {"text": "},\n"}, "id": i} for i in range(1, 50)]
+        test_file.write_text(json.dumps(records, indent=4), encoding="utf-8")
+
+        with open(test_file, "r", encoding="utf-8") as json_file:
+            batches = list(_iter_json_array(json_file, chunk_size=64))
+
+        assert len(batches) > 1
+        assert [item for batch in batches for item in batch] == records
+
+    def test_transactions_are_materialized_on_access(self, tmp_path) -> None:
+        test_file = str(tmp_path / "test_transactions.json")
+        manager = FinanceManager(test_file)
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", "Almuerzo", date(2001, 1, 1)))
+        manager.add_transaction(Transaction("Ingreso", 10000, "Salario", transaction_date=date(2001, 6, 15)))
+        manager.save_to_file()
+
+        new_manager = FinanceManager(test_file)
+
+        assert all(isinstance(t, TransactionRecord) for t in new_manager._by_id.values())
+        assert new_manager.balance == 5000
+        assert new_manager.filter_transactions(category="comida")[0].description == "almuerzo"
+        assert isinstance(new_manager._by_id[1], Transaction)
+        assert isinstance(new_manager._by_id[2], TransactionRecord)
+        assert new_manager.find_transaction_by_id(2).amount == 10000
+        assert [str(t) for t in new_manager.transactions] == [str(t) for t in manager.transactions]
+
+    def test_batch_and_single_loads_normalize_alike(self) -> None:
+        data = [{"id": 1, "t_type": "Gasto", "amount": 12.5, "category": "Comida", "description": "Almuerzo",
+                 "transaction_date": "01/01/01"},
+                {"id": 2, "t_type": "Gasto", "amount": 3, "category": "ocio", "description": "",
+                 "transaction_date": "02/01/01"}]
+
+        assert TransactionRecord.from_dicts(data) == [TransactionRecord.from_dict(item) for item in data]
+        assert [record.description for record in TransactionRecord.from_dicts(data)] == ["almuerzo", None]
+
+    def test_parse_date_is_cached(self) -> None:
+        assert parse_date("15/06/01") is parse_date("15/06/01")
+        assert parse_date("15/06/01") == date(2001, 6, 15)
+
+
+class TestPlotting:
+    def test_manager_import_skips_plotting_libraries(self) -> None:
+        code = "import sys, manager; print(sorted({'matplotlib', 'numpy'} & set(sys.modules)))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        assert result.stdout.strip() == "[]"
+
+    def test_headless_render_returns_bytes_and_writes_file(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"))
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+        manager.add_transaction(Transaction("Gasto", 1000, "Transporte", transaction_date=date(2001, 1, 30)))
+
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="png").startswith(b"\x89PNG")
+        svg = manager.plot_monthly_summary_by_category(1, 2001, path=str(tmp_path / "resumen.svg"))
+        assert b"<svg" in svg
+        assert (tmp_path / "resumen.svg").read_bytes() == svg
+        assert manager.plot_monthly_summary_by_category(2, 2001, image_format="png") is None
+
+        with pytest.raises(ValueError):
+            manager.plot_monthly_summary_by_category(1, 2001, image_format="bmp")
+
+
+class TestChartCache:
+    @pytest.fixture
+    def renders(self, monkeypatch) -> list[tuple[int, int]]:
+        import plotting
+
+        calls = []
+        render = plotting.render_monthly_summary
+
+        def counting_render(summary, month, year, image_format="png"):
+            calls.append((month, year))
+            return render(summary, month, year, image_format)
+
+        monkeypatch.setattr(plotting, "render_monthly_summary", counting_render)
+        return calls
+
+    def test_repeat_views_come_from_the_cache(self, tmp_path, renders) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"))
+        manager.add_transaction(Transaction("Gasto", 5000, "Comida", transaction_date=date(2001, 1, 1)))
+        manager.add_transaction(Transaction("Gasto", 1000, "Ocio", transaction_date=date(2001, 2, 1)))
+
+        image = manager.plot_monthly_summary_by_category(1, 2001, image_format="png")
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="png") == image
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="svg") != image
+        assert renders == [(1, 2001), (1, 2001)]
+        assert manager.chart_cache.hits == 1
+
+        # Only changes to the month itself invalidate its chart
+        manager.update_transaction(2, amount=2000)
+        manager.plot_monthly_summary_by_category(1, 2001, image_format="png")
+        assert len(renders) == 2
+
+        manager.add_transaction(Transaction("Gasto", 10, "Cafe", transaction_date=date(2001, 1, 31)))
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="png") != image
+        manager.update_transaction(3, transaction_date=date(2001, 2, 2))
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="png") == image
+        manager.delete_transaction(1)
+        assert manager.plot_monthly_summary_by_category(1, 2001, image_format="png") is None
+        assert len(renders) == 4
+
+        manager.load_from_file()
+        manager.plot_monthly_summary_by_category(2, 2001, image_format="png")
+        manager.plot_monthly_summary_by_category(2, 2001, image_format="png")
+        assert len(renders) == 5
+
+    def test_size_limit_and_disk_persistence(self, tmp_path, renders) -> None:
+        test_file = str(tmp_path / "test_transactions.json")
+        charts = tmp_path / "graficos"
+        manager = FinanceManager(test_file, chart_cache_size=2, chart_cache_dir=str(charts))
+        manager.add_transactions([Transaction("Gasto", 100, "Comida", transaction_date=date(2001, month, 1))
+                                  for month in (1, 2, 3)])
+        manager.save_to_file()
+
+        for month in (1, 2, 3, 1):
+            manager.plot_monthly_summary_by_category(month, 2001, image_format="png")
+        assert len(manager.chart_cache) == 2
+        # January was evicted from memory but read back from disk
+        assert len(renders) == 3
+        assert len(list(charts.iterdir())) == 3
+
+        manager.update_transaction(1, amount=200)
+        manager.plot_monthly_summary_by_category(1, 2001, image_format="png")
+        assert len(renders) == 4
+        assert len(list(charts.iterdir())) == 3
+
+        new_manager = FinanceManager(test_file, chart_cache_dir=str(charts))
+        new_manager.plot_monthly_summary_by_category(2, 2001, path=str(tmp_path / "febrero.png"))
+        assert len(renders) == 4
+        assert (tmp_path / "febrero.png").read_bytes().startswith(b"\x89PNG")
+
+
+class TestMoney:
+    @pytest.mark.parametrize("filename, columnar", [("transactions.json", False), ("transactions.json", True),
+                                                    ("transactions.db", False)])
+    def test_balance_is_exact_and_verified(self, tmp_path, filename, columnar) -> None:
+        manager = FinanceManager(str(tmp_path / filename), columnar=columnar)
+        manager.add_transactions([Transaction("Ingreso", 0.1, "Intereses") for _ in range(1000)])
+        manager.add_transactions([Transaction("Gasto", 0.7, "Cafe") for _ in range(100)])
+        assert manager.balance == 30
+        assert manager.verify_balance()
+
+        manager.delete_transactions(range(1, 1001))
+        assert manager.balance == -70
+        manager._balance_cents += 1
+        assert not manager.verify_balance()
+        assert manager.balance == -70
+
+    def test_balance_history_follows_edits(self, tmp_path) -> None:
+        manager = FinanceManager(str(tmp_path / "test_transactions.json"), debug=True)
+        manager.add_transactions([Transaction("Ingreso", 1000, "Salario", transaction_date=date(2001, 1, 15)),
+                                  Transaction("Gasto", 250.5, "Comida", transaction_date=date(2001, 2, 3)),
+                                  Transaction("Gasto", 100, "Ocio", transaction_date=date(2001, 3, 31))])
+
+        assert manager.balance_at(date(2001, 1, 14)) == 0
+        assert manager.balance_at(date(2001, 2, 3)) == 749.5
+        assert manager.balance_series(date(2001, 1, 1), date(2001, 4, 15)) == [
+            (date(2001, 1, 1), 1000), (date(2001, 2, 1), 749.5), (date(2001, 3, 1), 649.5), (date(2001, 4, 1), 649.5)]
+
+        manager.update_transaction(2, transaction_date=date(2000, 12, 31))
+        manager.delete_transaction(3)
+        manager.add_transaction(Transaction("Ingreso", 50, "Ventas", transaction_date=date(2001, 1, 1)), False)
+        assert manager.balance_series(date(2000, 12, 25), date(2001, 1, 20), "week") == [
+            (date(2000, 12, 25), -250.5), (date(2001, 1, 1), -200.5), (date(2001, 1, 8), -200.5),
+            (date(2001, 1, 15), 799.5)]
+        assert manager.balance_at(date(2001, 12, 31)) == manager.balance
+
+    def test_json_format_is_unchanged(self, tmp_path) -> None:
+        test_file = tmp_path / "test_transactions.json"
+        data = [{"id": 1, "t_type": "Gasto", "amount": 19.99, "category": "comida", "description": None,
+                 "transaction_date": "01/01/01"},
+                {"id": 2, "t_type": "Ingreso", "amount": 0.3, "category": "intereses", "description": None,
+                 "transaction_date": "02/01/01"}]
+        test_file.write_text(json.dumps(data, indent=4), encoding="utf-8")
+
+        manager = FinanceManager(str(test_file))
+        assert manager.find_transaction_by_id(1).cents == 1999
+        assert manager.balance == -19.69
+        manager.save_to_file()
+        assert json.loads(test_file.read_text(encoding="utf-8")) == data
+        assert str(manager.find_transaction_by_id(1)).startswith("[1] Gasto    | $19.99 ")
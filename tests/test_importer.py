@@ -0,0 +1,88 @@
+from datetime import date
+
+import pytest
+
+from manager import FinanceManager
+from models import Transaction
+
+MAPPING = {"amount": "Monto", "category": "Categoria", "description": "Detalle", "transaction_date": "Fecha"}
+
+
+def _write_csv(path, lines: list[str]) -> str:
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+class TestImportCsv:
+    def test_import_derives_type_from_sign(self, tmp_path) -> None:
+        csv_file = _write_csv(tmp_path / "extracto.csv", [
+            "Fecha,Monto,Categoria,Detalle",
+            "01/01/01,-5000,Comida,Almuerzo",
+            "15/01/01,10000,Salario,",
+            "30/01/01,-1000,Transporte,Uber",
+        ])
+        manager = FinanceManager(str(tmp_path / "transactions.json"), journaled=True)
+        manager.add_transaction(Transaction("Gasto", 100, "Comida"), show_message=False)
+        # Build the indexes first so the import has to extend them
+        assert manager.get_monthly_summary_by_category(1, 2001) == []
+
+        report = manager.import_csv(csv_file, MAPPING, batch_size=2)
+
+        assert (report.rows, report.imported, sum(report.errors.values())) == (3, 3, 0)
+        assert [t.id for t in manager.transactions] == [1, 2, 3, 4]
+        assert manager.next_id == 5
+        assert manager.balance == 3900
+        assert manager.find_transaction_by_id(4).description == "uber"
+        assert manager.get_monthly_summary_by_category(1, 2001) == [("comida", 5000), ("transporte", 1000)]
+
+        # Imported rows go through the journal like any other change
+        reloaded = FinanceManager(str(tmp_path / "transactions.json"), journaled=True)
+        assert [t.to_dict() for t in reloaded.transactions] == [t.to_dict() for t in manager.transactions]
+
+    def test_invalid_rows_are_reported(self, tmp_path) -> None:
+        csv_file = _write_csv(tmp_path / "extracto.csv", [
+            "Tipo;Fecha;Monto;Categoria",
+            "gasto;01/01/01;5000;Comida",
+            "gasto;2001-01-02;5000;Comida",
+            "otro;03/01/01;5000;Comida",
+            "ingreso;04/01/01;abc;Salario",
+            "ingreso;05/01/01;-10;Salario",
+            "ingreso;06/01/01;10;",
+        ])
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        mapping = {"t_type": "Tipo", "amount": "Monto", "category": "Categoria", "transaction_date": "Fecha"}
+
+        report = manager.import_csv(csv_file, mapping, delimiter=";")
+
+        assert (report.rows, report.imported) == (6, 1)
+        assert report.errors == {"fecha inválida": 1, "tipo inválido": 1, "monto inválido": 1,
+                                 "el monto debe ser positivo": 1, "falta la categoría": 1}
+        assert report.examples[0] == (3, "fecha inválida")
+        assert manager.filter_transactions(date_from=date(2001, 1, 1))[0].amount == 5000
+        assert "1 de 6 filas" in str(report)
+
+    def test_ragged_rows_are_reported(self, tmp_path) -> None:
+        csv_file = _write_csv(tmp_path / "extracto.csv", [
+            "Fecha,Monto,Categoria,Detalle",
+            "01/01/24,-5,Comida,Almuerzo",
+            "02/01/24,5",
+            "03/01/24,-5,Comida,Cena,extra",
+            "04/01/24,-7,Comida,",
+        ])
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+
+        report = manager.import_csv(csv_file, MAPPING)
+
+        assert (report.rows, report.imported) == (4, 2)
+        assert report.errors == {"fila incompleta": 2}
+        assert [line for line, _ in report.examples] == [3, 4]
+        assert manager.balance == -12
+
+    def test_mapping_must_match_file(self, tmp_path) -> None:
+        csv_file = _write_csv(tmp_path / "extracto.csv", ["Fecha,Monto", "01/01/01,-5000"])
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+
+        with pytest.raises(ValueError):
+            manager.import_csv(csv_file, {"amount": "Monto", "transaction_date": "Fecha"})
+        with pytest.raises(ValueError):
+            manager.import_csv(csv_file, MAPPING)
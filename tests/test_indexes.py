@@ -0,0 +1,113 @@
+from datetime import date
+
+import pytest
+
+from indexes import TOKENIZE_CACHE_SIZE, BalanceIndex, DateIndex, SummaryCube, TextIndex, tokenize
+from models import Transaction
+
+
+def _transaction(transaction_id: int, transaction_date: date) -> Transaction:
+    transaction = Transaction("Gasto", 100, "Comida", transaction_date=transaction_date)
+    transaction.id = transaction_id
+    return transaction
+
+
+class TestDateIndex:
+    def test_range_queries(self) -> None:
+        index = DateIndex()
+        index.extend([_transaction(1, date(2001, 6, 15)), _transaction(2, date(2001, 1, 1))])
+        index.add(_transaction(3, date(2001, 12, 30)))
+        index.add(_transaction(4, date(2001, 6, 15)))
+
+        assert list(index.between()) == [2, 1, 4, 3]
+        assert list(index.between(date_from=date(2001, 6, 15))) == [1, 4, 3]
+        assert list(index.between(date_to=date(2001, 6, 14))) == [2]
+        assert list(index.between(date(2002, 1, 1), date(2002, 12, 31))) == []
+
+    def test_out_of_order_batch_is_merged(self) -> None:
+        index = DateIndex()
+        index.extend([_transaction(1, date(2001, 6, 15)), _transaction(2, date(2001, 12, 30))])
+        index.extend([_transaction(3, date(2001, 1, 1)), _transaction(4, date(2002, 1, 1))])
+
+        assert list(index.between()) == [3, 1, 2, 4]
+
+    def test_discard(self) -> None:
+        index = DateIndex()
+        transactions = [_transaction(i, date(2001, 1, 1)) for i in range(1, 4)]
+        index.extend(transactions)
+        index.discard(transactions[1])
+
+        assert list(index.between(date(2001, 1, 1), date(2001, 1, 1))) == [1, 3]
+        assert len(index) == 2
+
+
+class TestSummaryCube:
+    def test_totals_follow_add_and_discard(self) -> None:
+        cube = SummaryCube()
+        t1 = _transaction(1, date(2001, 1, 1))
+        t2 = _transaction(2, date(2001, 1, 30))
+        t3 = _transaction(3, date(2001, 2, 1))
+        cube.extend([t1, t2, t3])
+
+        assert cube.totals(2001, 1, "Gasto") == {"comida": 200}
+        assert cube.totals(2001, 1, "Ingreso") == {}
+
+        cube.discard(t3)
+        cube.discard(t1)
+
+        assert cube.totals(2001, 1, "Gasto") == {"comida": 100}
+        assert cube.totals(2001, 2, "Gasto") == {}
+
+
+class TestBalanceIndex:
+    def test_balance_follows_changes_in_the_past(self) -> None:
+        index = BalanceIndex()
+        income = Transaction("Ingreso", 1000, "Salario", transaction_date=date(2001, 1, 15))
+        income.id = 4
+        index.extend([_transaction(1, date(2001, 1, 1)), _transaction(2, date(2001, 2, 1)), income])
+
+        assert index.balance_at(date(2000, 12, 31)) == 0
+        assert index.balance_at(date(2001, 1, 1)) == -10000
+        assert index.balance_at(date(2001, 1, 31)) == 90000
+        assert index.balance_at(date(2002, 1, 1)) == 80000
+
+        index.add(_transaction(3, date(2001, 1, 10)))
+        index.discard(income)
+        assert index.balance_at(date(2001, 1, 31)) == -20000
+
+        # An out-of-order batch is merged into the indexed days
+        index.extend([_transaction(5, date(2000, 6, 1)), _transaction(6, date(2001, 3, 1))])
+        assert index.balance_at(date(2000, 12, 31)) == -10000
+        assert index.balance_at(date(2002, 1, 1)) == -50000
+
+
+class TestTextIndex:
+    def test_queries(self) -> None:
+        index = TextIndex()
+        descriptions = ["Netflix", "Uber al aeropuerto", "uber", "Taxi", "Café con Netflix", None]
+        transactions = []
+        for transaction_id, description in enumerate(descriptions, 1):
+            transaction = Transaction("Gasto", 10, "Ocio" if transaction_id % 2 else "Transporte", description)
+            transaction.id = transaction_id
+            transactions.append(transaction)
+        index.extend(transactions)
+
+        assert index.search("netflix") == {1, 5}
+        assert index.search("NET*") == {1, 5}
+        assert index.search("uber -aeropuerto") == {3}
+        assert index.search("uber OR taxi") == {2, 3, 4}
+        assert index.search("cafe netflix") == {5}
+        assert index.search("ocio") == {1, 3, 5}
+        assert index.search("spotify") == set()
+
+        index.discard(transactions[0])
+        assert index.search("net*") == {5}
+
+        with pytest.raises(ValueError):
+            index.search("-uber")
+
+    def test_tokenize_cache_is_bounded(self) -> None:
+        tokenize.cache_clear()
+        for number in range(TOKENIZE_CACHE_SIZE + 10):
+            tokenize(f"transferencia {number}")
+        assert tokenize.cache_info().currsize == TOKENIZE_CACHE_SIZE
@@ -0,0 +1,79 @@
+import json
+import os
+import subprocess
+import sys
+
+from datetime import date
+
+import pytest
+
+from instrumentation import ENV_VAR
+from manager import OPERATIONS, FinanceManager
+
+
+def _run_session(tmp_path, instrument: bool | None, environment: dict[str, str],
+                 extra_code: str = "") -> subprocess.CompletedProcess[str]:
+    code = ("from manager import FinanceManager; from models import Transaction; "
+            f"manager = FinanceManager({str(tmp_path / 'transactions.json')!r}, instrument={instrument}); "
+            "manager.add_transaction(Transaction('Gasto', 10, 'comida'), show_message=False); "
+            "manager.save_to_file()" + extra_code)
+    base = {name: value for name, value in os.environ.items() if name != ENV_VAR}
+    return subprocess.run([sys.executable, "-c", code], check=True, capture_output=True, text=True,
+                          env={**base, **environment},
+                          cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestInstrumentation:
+    def test_disabled_leaves_methods_unwrapped(self, tmp_path, monkeypatch, fill) -> None:
+        monkeypatch.delenv(ENV_VAR, raising=False)
+        manager = FinanceManager(str(tmp_path / "transactions.json"))
+        fill(manager)
+        manager.filter_transactions(category="comida")
+
+        assert manager.stats() == {}
+        assert not set(OPERATIONS) & set(vars(manager))
+
+    def test_records_calls_rows_and_bytes(self, tmp_path, fill) -> None:
+        test_file = str(tmp_path / "transactions.json")
+        manager = FinanceManager(test_file, instrument=True)
+        fill(manager)
+        manager.save_to_file()
+        saved_size = os.path.getsize(test_file)
+
+        manager = FinanceManager(test_file, instrument=True, thread_safe=True)
+        manager.filter_transactions(date_from=date(2001, 1, 10), date_to=date(2001, 1, 31), category="comida")
+        manager.filter_transactions(date_from=date(2001, 1, 10))
+        manager.search("almuerzo")
+        manager.get_monthly_summary_by_category(1, 2001)
+        manager.update_transaction(1, amount=10)
+        manager.save_to_file()
+
+        stats = manager.stats()
+        assert stats["load_from_file"]["calls"] == 1
+        assert stats["load_from_file"]["rows"] == 4
+        assert stats["load_from_file"]["bytes_read"] == saved_size
+        assert stats["filter_transactions"]["calls"] == 3
+        # Indexes are built on the first filter and the text index on the first search (4 rows each);
+        # then each filter scans only the rows its date range or search selects
+        assert stats["filter_transactions"]["rows"] == 4 + 2 + 3 + 4 + 1
+        assert stats["search"] == {**stats["search"], "calls": 1, "rows": 4 + 1}
+        assert stats["save_to_file"]["bytes_written"] == os.path.getsize(test_file)
+        assert stats["save_to_file"]["bytes_read"] == 0
+        assert "delete_transaction" not in stats
+        assert all(values["seconds"] >= 0 for values in stats.values())
+
+    @pytest.mark.parametrize("instrument", [None, True])
+    def test_environment_variable_dumps_stats_at_exit(self, tmp_path, instrument) -> None:
+        stats_file = tmp_path / "stats.json"
+        _run_session(tmp_path, instrument, {ENV_VAR: str(stats_file)})
+
+        stats = json.loads(stats_file.read_text(encoding="utf-8"))
+        assert stats["add_transaction"]["calls"] == 1
+        assert stats["save_to_file"]["bytes_written"] > 0
+
+    def test_flag_alone_only_collects(self, tmp_path) -> None:
+        # instrument=True is for stats(); without the environment variable nothing is reported at exit
+        result = _run_session(tmp_path, True, {}, "; print(manager.stats()['add_transaction']['calls'])")
+
+        assert result.stdout.strip() == "1"
+        assert result.stderr == ""
@@ -0,0 +1,129 @@
+import asyncio
+
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+import pytest
+
+from manager import FinanceManager
+from server import Client, FinanceService
+
+
+def _run(filename: str, scenario: Callable[[FinanceService, Client], Awaitable[Any]]) -> Any:
+    async def main() -> Any:
+        service = FinanceService(FinanceManager(filename, journaled=True))
+        await service.start(port=0)
+        client = Client(port=service.port)
+        try:
+            return await scenario(service, client)
+        finally:
+            await client.close()
+            await service.stop()
+
+    return asyncio.run(main())
+
+
+class TestService:
+    @pytest.mark.parametrize("filename", ["transactions.json", "transactions.db"])
+    def test_reads_and_writes(self, tmp_path, filename) -> None:
+        test_file = str(tmp_path / filename)
+
+        async def scenario(service: FinanceService, client: Client) -> None:
+            status, added = await client.request("POST", "/transactions", [
+                {"t_type": "Gasto", "amount": 25.5, "category": "Comida", "description": "Uber eats",
+                 "transaction_date": "15/06/24"},
+                {"t_type": "Ingreso", "amount": 3000, "category": "salario", "transaction_date": "30/06/24"},
+            ])
+            assert status == 201
+            assert [t["id"] for t in added] == [1, 2]
+
+            assert await client.request("GET", "/balance") == (200, {"balance": 2974.5})
+            assert await client.request("GET", "/summary?month=6&year=2024") == (200, {"comida": 25.5})
+            status, results = await client.request("GET", "/transactions?category=comida&from=01/06/24&q=uber")
+            assert [t["id"] for t in results] == [1]
+
+            status, updated = await client.request("PATCH", "/transactions/1", {"amount": 30, "category": "ocio"})
+            assert (status, updated["category"]) == (200, "ocio")
+            assert (await client.request("DELETE", "/transactions/2"))[0] == 200
+            assert (await client.request("GET", "/transactions/2"))[0] == 404
+            assert await client.request("GET", "/balance") == (200, {"balance": -30})
+
+        _run(test_file, scenario)
+        assert [t.to_dict() for t in FinanceManager(test_file, journaled=True).transactions] == [
+            {"id": 1, "t_type": "Gasto", "amount": 30, "category": "ocio", "description": "uber eats",
+             "transaction_date": "15/06/24"}]
+
+    def test_invalid_requests(self, tmp_path) -> None:
+        async def scenario(service: FinanceService, client: Client) -> None:
+            assert (await client.request("POST", "/transactions", {"t_type": "Gasto", "amount": -1,
+                                                                   "category": "comida"}))[0] == 400
+            assert (await client.request("PATCH", "/transactions/1", {"color": "rojo"}))[0] == 400
+            assert (await client.request("PATCH", "/transactions/1", {"transaction_date": None}))[0] == 400
+            for amount in (0.004, 1e999, float("nan")):
+                assert (await client.request("POST", "/transactions", {"t_type": "Gasto", "amount": amount,
+                                                                       "category": "comida"}))[0] == 400
+                assert (await client.request("PATCH", "/transactions/1", {"amount": amount}))[0] == 400
+            assert (await client.request("PATCH", "/transactions/1", {"category": "ocio"}))[0] == 404
+            assert (await client.request("GET", "/summary?month=13&year=2024"))[0] == 400
+            assert (await client.request("GET", "/transactions?from=ayer"))[0] == 400
+            assert (await client.request("GET", "/nada"))[0] == 404
+            assert await client.request("GET", "/balance") == (200, {"balance": 0})
+
+        _run(str(tmp_path / "transactions.json"), scenario)
+
+    def test_concurrent_writes_are_group_committed(self, tmp_path) -> None:
+        test_file = str(tmp_path / "transactions.json")
+
+        async def scenario(service: FinanceService, client: Client) -> None:
+            async def post(writer: int) -> list[tuple[int, Any]]:
+                # Each connection sends its requests one after another, like a real client
+                other = Client(port=service.port)
+                try:
+                    return [await other.request("POST", "/transactions", {
+                        "t_type": "Gasto", "amount": 1, "category": "comida", "description": f"compra {writer}-{number}"})
+                        for number in range(5)]
+                finally:
+                    await other.close()
+
+            responses = [response for responses in await asyncio.gather(*map(post, range(40)))
+                         for response in responses]
+            assert {status for status, _ in responses} == {201}
+            assert len({transaction["id"] for _, transaction in responses}) == 200
+            assert service.writes == 200
+            assert service.commits < 200
+
+        _run(test_file, scenario)
+        manager = FinanceManager(test_file, journaled=True)
+        assert len(manager) == 200
+        assert manager.balance == -200
+
+    def test_failed_commit_fails_its_batch_and_keeps_serving(self, tmp_path) -> None:
+        test_file = str(tmp_path / "transactions.json")
+        manager = FinanceManager(test_file)
+        save_to_file = manager.save_to_file
+        failures = [ValueError("instantánea ilegible")]
+
+        def failing_save() -> None:
+            if failures:
+                raise failures.pop()
+            save_to_file()
+
+        manager.save_to_file = failing_save
+        item = {"t_type": "Gasto", "amount": 10, "category": "comida"}
+
+        async def main() -> None:
+            service = FinanceService(manager)
+            await service.start(port=0)
+            client = Client(port=service.port)
+            try:
+                assert (await client.request("POST", "/transactions", item))[0] == 500
+                # The rejected write was rolled back in memory, and the writer is still running
+                assert await client.request("GET", "/balance") == (200, {"balance": 0})
+                assert (await client.request("POST", "/transactions", item))[0] == 201
+                assert await client.request("GET", "/balance") == (200, {"balance": -10})
+            finally:
+                await client.close()
+                await asyncio.wait_for(service.stop(), 10)
+
+        asyncio.run(main())
+        assert [t.amount for t in FinanceManager(test_file).transactions] == [10]
@@ -0,0 +1,62 @@
+from datetime import date
+
+import pytest
+
+from manager import FinanceManager
+from storage import JsonBackend, SqliteBackend, main, migrate, open_backend
+
+
+class TestStorage:
+    def test_backend_is_picked_by_extension(self) -> None:
+        assert isinstance(open_backend("transactions.json"), JsonBackend)
+        assert isinstance(open_backend("transactions.db"), SqliteBackend)
+        assert isinstance(open_backend("ledger.SQLITE"), SqliteBackend)
+
+    def test_sqlite_writes_changes_as_they_happen(self, tmp_path, fill) -> None:
+        test_file = str(tmp_path / "transactions.db")
+        manager = FinanceManager(test_file)
+        fill(manager)
+        manager.delete_transactions([2])
+
+        # No save_to_file: every change is already committed
+        new_manager = FinanceManager(test_file)
+
+        assert [str(t) for t in new_manager.transactions] == [str(t) for t in manager.transactions]
+        assert new_manager.balance == -8000
+        assert new_manager.next_id == 5
+        # Amounts are stored as exact integer cents
+        assert new_manager.storage.connection.execute(
+            "SELECT id, cents, typeof(cents) FROM transactions ORDER BY id").fetchall() == [
+            (1, 500000, "integer"), (3, 100000, "integer"), (4, 200000, "integer")]
+
+    @pytest.mark.parametrize("query", [
+        {},
+        {"category": "Comida"},
+        {"t_type": "gasto"},
+        {"date_from": date(2001, 1, 15), "date_to": date(2001, 1, 30)},
+        {"category": "comida", "t_type": "Gasto", "date_to": date(2001, 1, 31)},
+    ])
+    def test_sqlite_queries_match_in_memory(self, tmp_path, fill, query) -> None:
+        json_manager = FinanceManager(str(tmp_path / "transactions.json"))
+        sqlite_manager = FinanceManager(str(tmp_path / "transactions.db"))
+        fill(json_manager)
+        fill(sqlite_manager)
+
+        assert [t.id for t in sqlite_manager.filter_transactions(**query)] == \
+               [t.id for t in json_manager.filter_transactions(**query)]
+        assert sqlite_manager.get_monthly_summary_by_category(1, 2001) == \
+               json_manager.get_monthly_summary_by_category(1, 2001) == [("comida", 5000), ("transporte", 1000)]
+
+    def test_migrate_json_to_sqlite_and_back(self, tmp_path, capsys, fill) -> None:
+        json_file = str(tmp_path / "transactions.json")
+        sqlite_file = str(tmp_path / "transactions.db")
+        json_manager = FinanceManager(json_file, journaled=True)
+        fill(json_manager)
+
+        main([json_file, sqlite_file])
+        assert "4 transacciones" in capsys.readouterr().out
+
+        back_file = str(tmp_path / "back.json")
+        assert migrate(SqliteBackend(sqlite_file), JsonBackend(back_file)) == 4
+        assert [t.to_dict() for t in FinanceManager(back_file).transactions] == \
+               [t.to_dict() for t in json_manager.transactions]